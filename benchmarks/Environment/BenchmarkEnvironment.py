@@ -0,0 +1,87 @@
+"""
+BenchmarkEnvironment.py
+Synthetic SofaEnvironment used to benchmark the data production path.
+At each step, the positions of a MechanicalObject are randomly updated, the input is the positions and the ground truth
+is their mean. Each instance measures the latency of its phases and reports them in a JSON file when closed.
+"""
+
+# Python related imports
+import json
+from os import environ
+from os.path import join
+from time import perf_counter
+from resource import getrusage, RUSAGE_SELF
+from numpy import ndarray, mean, percentile
+from numpy.random import random
+
+# DeepPhysX related imports
+from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
+
+
+class BenchmarkEnvironment(SofaEnvironment):
+
+    def __init__(self,
+                 as_tcp_ip_client=True,
+                 instance_id=1,
+                 instance_nb=1,
+                 nb_nodes=1000):
+
+        SofaEnvironment.__init__(self,
+                                 as_tcp_ip_client=as_tcp_ip_client,
+                                 instance_id=instance_id,
+                                 instance_nb=instance_nb)
+
+        # Environment parameters
+        self.nb_nodes = nb_nodes
+        self.MO = None
+
+        # Latency of each phase, reported in the directory given by the DEEPPHYSX_SOFA_BENCHMARK_DIR variable
+        self.latencies = {'scene_update': [], 'step': [], 'on_step': []}
+        self.report_dir = environ.get('DEEPPHYSX_SOFA_BENCHMARK_DIR', None)
+
+    def create(self):
+
+        self.root.addChild('object')
+        self.MO = self.root.object.addObject('MechanicalObject', name='MO',
+                                             position=random((self.nb_nodes, 3)).tolist())
+
+    def init_database(self):
+
+        self.define_training_fields(fields=[('input', ndarray), ('ground_truth', ndarray)])
+
+    def onAnimateBeginEvent(self, _):
+
+        start = perf_counter()
+        self.MO.position.value = random((self.nb_nodes, 3))
+        self.latencies['scene_update'].append(perf_counter() - start)
+
+    async def step(self):
+
+        start = perf_counter()
+        await SofaEnvironment.step(self)
+        self.latencies['step'].append(perf_counter() - start)
+
+    async def on_step(self):
+
+        start = perf_counter()
+        position = self.MO.position.array()
+        self.set_training_data(input=position.copy(),
+                               ground_truth=mean(position, axis=0))
+        self.latencies['on_step'].append(perf_counter() - start)
+
+    def close(self):
+
+        SofaEnvironment.close(self)
+        if self.report_dir is None:
+            return
+        report = {'instance_id': self.instance_id,
+                  # Peak resident memory of the process in Mb (ru_maxrss is given in Kb on Linux)
+                  'max_rss': getrusage(RUSAGE_SELF).ru_maxrss / 1024,
+                  'latencies': {}}
+        for phase, latencies in self.latencies.items():
+            if len(latencies) > 0:
+                p50, p95, p99 = percentile(latencies, [50, 95, 99])
+                report['latencies'][phase] = {'mean': float(mean(latencies)), 'p50': float(p50),
+                                              'p95': float(p95), 'p99': float(p99), 'count': len(latencies)}
+        with open(join(self.report_dir, f'client_{self.instance_id}.json'), 'w') as file:
+            json.dump(report, file, indent=4)
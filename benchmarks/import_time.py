@@ -0,0 +1,50 @@
+"""
+import_time.py
+Measure the import time of the DeepPhysX.Sofa packages and symbols in fresh Python interpreters, as paid by every
+spawned client.
+Use 'python3 import_time.py' to print the results.
+Use 'python3 import_time.py -o results.json' to also save the results in a file.
+"""
+
+# Python related imports
+import sys
+import json
+from subprocess import run
+from statistics import median
+
+# Import statements to benchmark
+statements = ['import DeepPhysX.Sofa.Environment',
+              'import DeepPhysX.Sofa.Pipeline',
+              'from DeepPhysX.Sofa.Environment import SofaEnvironment',
+              'from DeepPhysX.Sofa.Environment import SofaEnvironmentConfig',
+              'from DeepPhysX.Sofa.Pipeline import SofaPrediction']
+nb_runs = 10
+
+
+def measure(statement):
+
+    # Time the statement in a new interpreter so that no module is already loaded
+    code = f"from time import perf_counter; start = perf_counter(); {statement}; print(perf_counter() - start)"
+    timings = []
+    for _ in range(nb_runs):
+        result = run([sys.executable, '-c', code], capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().split('\n')[-1]))
+    return {'median': median(timings), 'min': min(timings), 'max': max(timings)}
+
+
+if __name__ == '__main__':
+
+    # Run benchmark
+    results = {statement: measure(statement) for statement in statements}
+    for statement, timings in results.items():
+        if timings is None:
+            print(f"{statement:<70} failed")
+        else:
+            print(f"{statement:<70} {timings['median'] * 1e3:8.1f} ms (min {timings['min'] * 1e3:.1f} ms)")
+
+    # Save results
+    if len(sys.argv) > 2 and sys.argv[1] == '-o':
+        with open(sys.argv[2], 'w') as file:
+            json.dump(results, file, indent=4)
@@ -0,0 +1,46 @@
+"""
+prediction_speed.py
+Measure the speed of a trained demo Network in SofaPrediction without SOFA GUI: the frames are animated as fast as
+possible and the frames/s and the latency of each phase are reported.
+Use 'python3 prediction_speed.py ../examples/demos/Beam/FC' to benchmark the Beam FC demo.
+Use 'python3 prediction_speed.py ../examples/demos/Liver/UNet --steps 1000 -o results.json' to save the results.
+The trained session of the demo must be available (run 'python3 download.py' in the demo directory first).
+"""
+
+# Python related imports
+import os
+import sys
+import json
+from argparse import ArgumentParser
+from importlib.util import spec_from_file_location, module_from_spec
+
+
+def load_create_runner(demo_dir):
+
+    # The demo scripts use paths relative to their directory
+    os.chdir(demo_dir)
+    sys.path.insert(0, demo_dir)
+    spec = spec_from_file_location('demo_prediction', os.path.join(demo_dir, 'prediction.py'))
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.create_runner
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description='Benchmark a trained demo Network in SofaPrediction without SOFA GUI.')
+    parser.add_argument('demo', help='Directory of the demo containing the prediction.py script.')
+    parser.add_argument('--steps', type=int, default=500, help='Number of frames to animate.')
+    parser.add_argument('-o', '--output', default=None, help='JSON file to save the results.')
+    args = parser.parse_args()
+    output = None if args.output is None else os.path.abspath(args.output)
+
+    # Create the SofaPrediction runner of the demo and run it without GUI
+    runner = load_create_runner(os.path.abspath(args.demo))()
+    results = runner.run_headless(nb_steps=args.steps)
+    results['phases'] = runner.timer.summary()
+
+    # Save results
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump({'demo': args.demo, 'results': results}, file, indent=4)
@@ -0,0 +1,122 @@
+"""
+throughput.py
+Measure the data production throughput of the SofaEnvironment step path with the synthetic BenchmarkEnvironment, both
+in-process and with several TCP-IP clients.
+The samples/s, the per-phase latency percentiles and the peak memory of each client are reported.
+Use 'python3 throughput.py' to run the default configurations.
+Use 'python3 throughput.py --clients 1 2 4 8 --nb-nodes 5000 -o results.json' to customize the runs and save the results.
+"""
+
+# Python related imports
+import os
+import sys
+import json
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# DeepPhysX related imports
+from DeepPhysX.Core.Pipelines.BaseDataGeneration import BaseDataGeneration
+from DeepPhysX.Core.Database.BaseDatabaseConfig import BaseDatabaseConfig
+from DeepPhysX.Sofa.Environment.SofaEnvironmentConfig import SofaEnvironmentConfig
+
+# Session related imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from Environment.BenchmarkEnvironment import BenchmarkEnvironment
+
+
+def run_benchmark(as_tcp_ip_client, nb_clients, args):
+
+    with TemporaryDirectory() as tmp_dir:
+
+        # Clients inherit the environment variables of the server process
+        report_dir = os.path.join(tmp_dir, 'reports')
+        os.makedirs(report_dir)
+        os.environ['DEEPPHYSX_SOFA_BENCHMARK_DIR'] = report_dir
+
+        # Environment configuration
+        environment_config = SofaEnvironmentConfig(environment_class=BenchmarkEnvironment,
+                                                   as_tcp_ip_client=as_tcp_ip_client,
+                                                   number_of_thread=nb_clients,
+                                                   simulations_per_step=args.substeps,
+                                                   client_start_method=args.start_method,
+                                                   env_kwargs={'nb_nodes': args.nb_nodes})
+        # Database configuration
+        database_config = BaseDatabaseConfig(max_file_size=1,
+                                             normalize=False)
+
+        # Create the pipeline, clients are launched at this point
+        start = perf_counter()
+        data_generator = BaseDataGeneration(environment_config=environment_config,
+                                            database_config=database_config,
+                                            session_dir=tmp_dir,
+                                            session_name='benchmark',
+                                            batch_nb=args.batch_nb,
+                                            batch_size=args.batch_size)
+        setup_time = perf_counter() - start
+
+        # Produce the samples
+        start = perf_counter()
+        data_generator.execute()
+        production_time = perf_counter() - start
+
+        # Gather the reports of the clients
+        clients = []
+        for file in sorted(os.listdir(report_dir)):
+            with open(os.path.join(report_dir, file)) as report:
+                clients.append(json.load(report))
+
+    nb_samples = args.batch_nb * args.batch_size
+    return {'mode': 'tcp' if as_tcp_ip_client else 'in-process',
+            'nb_clients': nb_clients,
+            'nb_samples': nb_samples,
+            'setup_time': setup_time,
+            'spin_up_latency': environment_config.spin_up_latency,
+            'production_time': production_time,
+            'samples_per_second': nb_samples / production_time,
+            'mean_max_rss': sum([c['max_rss'] for c in clients]) / max(len(clients), 1),
+            'clients': clients}
+
+
+def summarize(result):
+
+    print(f"{result['mode']:<12} {result['nb_clients']:>3} client(s) | {result['samples_per_second']:10.1f} samples/s"
+          f" | setup {result['setup_time']:6.2f} s | memory {result['mean_max_rss']:7.1f} Mb/client")
+    if result['spin_up_latency'] is not None:
+        print(f"    {'spin_up':<14} {result['spin_up_latency'] * 1e3:8.3f} ms")
+    for phase in ['scene_update', 'step', 'on_step']:
+        # Aggregate the percentiles of the clients using the worst client
+        values = [c['latencies'][phase] for c in result['clients'] if phase in c['latencies']]
+        if len(values) > 0:
+            p50, p95, p99 = [max([v[p] for v in values]) for p in ['p50', 'p95', 'p99']]
+            print(f"    {phase:<14} p50 {p50 * 1e3:8.3f} ms | p95 {p95 * 1e3:8.3f} ms | p99 {p99 * 1e3:8.3f} ms")
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(description='Benchmark the data production throughput of SofaEnvironment.')
+    parser.add_argument('--modes', nargs='+', choices=['in-process', 'tcp'], default=['in-process', 'tcp'])
+    parser.add_argument('--clients', nargs='+', type=int, default=[1, 2, 4], help='Numbers of TCP-IP clients.')
+    parser.add_argument('--nb-nodes', type=int, default=1000, help='Number of nodes of the synthetic scene.')
+    parser.add_argument('--substeps', type=int, default=1, help='Number of simulation steps per sample.')
+    parser.add_argument('--start-method', choices=['subprocess', 'forkserver'], default='subprocess',
+                        help='Start method of the TCP-IP clients.')
+    parser.add_argument('--batch-nb', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('-o', '--output', default=None, help='JSON file to save the results.')
+    args = parser.parse_args()
+
+    # Run benchmark
+    results = []
+    if 'in-process' in args.modes:
+        results.append(run_benchmark(as_tcp_ip_client=False, nb_clients=1, args=args))
+        summarize(results[-1])
+    if 'tcp' in args.modes:
+        for nb_clients in args.clients:
+            results.append(run_benchmark(as_tcp_ip_client=True, nb_clients=nb_clients, args=args))
+            summarize(results[-1])
+
+    # Save results
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'parameters': vars(args), 'results': results}, file, indent=4)
@@ -13,7 +13,6 @@ from numpy import array
 from numpy.random import uniform, choice
 
 # Sofa related imports
-import Sofa.Simulation
 import SofaRuntime
 
 # DeepPhysX related imports
@@ -105,6 +104,7 @@ class ArmadilloSofa(SofaEnvironment):
         # Grid topology of the model
         self.root.fem.addObject('SparseGridTopology', name='SparseGridTopo', src='@../MeshCoarse', n=p_grid.resolution)
         self.f_sparse_grid_mo = self.root.fem.addObject('MechanicalObject', name='SparseGridMO', src='@SparseGridTopo')
+        self.define_checkpoint(mechanical_objects=[self.f_sparse_grid_mo])
 
         # Material
         self.root.fem.addObject('SaintVenantKirchhoffMaterial', name='StVK', young_modulus=1000, poisson_ratio=0.45)
@@ -227,8 +227,8 @@ class ArmadilloSofa(SofaEnvironment):
         # Check if the solver converged while computing FEM
         if self.create_model['fem']:
             if not self.solver.converged.value:
-                # Reset simulation if solver diverged to avoid unwanted behaviour in following samples
-                Sofa.Simulation.reset(self.root)
+                # Restore the initial state if solver diverged to avoid unwanted behaviour in following samples
+                self.restore_checkpoint()
             return self.solver.converged.value
         return True
 
@@ -237,4 +237,5 @@ class ArmadilloSofa(SofaEnvironment):
         Shutdown procedure.
         """
 
+        SofaEnvironment.close(self)
         print("Bye!")
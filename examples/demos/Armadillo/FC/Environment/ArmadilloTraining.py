@@ -12,7 +12,7 @@ Training data are produced at each time step :
 # Python related imports
 import os
 import sys
-from numpy import ndarray, zeros, reshape
+from numpy import ndarray, zeros
 
 # Session related imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -96,6 +96,5 @@ class ArmadilloTraining(ArmadilloSofa):
         Apply the predicted displacement to the NN model.
         """
 
-        # Reshape to correspond to sparse grid
-        U = reshape(prediction['prediction'], self.output_size)
-        self.n_sparse_grid_mo.position.value = self.n_sparse_grid_mo.rest_position.value + U
+        # Write the predicted displacement of the sparse grid in place
+        self.apply_displacement(self.n_sparse_grid_mo, prediction['prediction'])
@@ -11,15 +11,38 @@ import sys
 from numpy import array
 from collections import namedtuple
 
+from DeepPhysX.Sofa.Utils.cache import cached_values
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils import compute_grid_resolution, define_bbox, find_extremities, find_fixed_box
 
 # Model
 mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/armadillo.obj'
 coarse_mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/armadillo_coarse.obj'
 scale = 1e-3
 scale3d = 3 * [scale]
-fixed_box = find_fixed_box(mesh, scale)
+margin_scale = 0.2
+cell_size = 0.06
+utils_file = os.path.dirname(os.path.abspath(__file__)) + '/utils.py'
+
+
+def compute_geometry():
+    """
+    Compute the parameters derived from the geometry of the mesh.
+    """
+
+    from utils import compute_grid_resolution, define_bbox, find_extremities, find_fixed_box
+    min_bbox, max_bbox, bbox = define_bbox(mesh, margin_scale, scale)
+    return {'fixed_box': find_fixed_box(mesh, scale),
+            'bbox': bbox,
+            'grid_resolution': compute_grid_resolution(max_bbox, min_bbox, cell_size),
+            'extremities': find_extremities(mesh, scale)}
+
+
+# Geometry is computed once per mesh content, then read from the cache
+geometry = cached_values(name='Armadillo.FC', compute=compute_geometry,
+                         files=[mesh, utils_file],
+                         scale=scale, margin_scale=margin_scale, cell_size=cell_size)
+fixed_box = geometry['fixed_box']
 model = {'mesh': mesh,
          'mesh_coarse': coarse_mesh,
          'scale': scale,
@@ -28,10 +51,8 @@ model = {'mesh': mesh,
 p_model = namedtuple('p_model', model)(**model)
 
 # Grid
-margin_scale = 0.2
-cell_size = 0.06
-min_bbox, max_bbox, bbox = define_bbox(mesh, margin_scale, scale)
-grid_resolution = compute_grid_resolution(max_bbox, min_bbox, cell_size)
+bbox = geometry['bbox']
+grid_resolution = geometry['grid_resolution']
 grid = {'bbox': bbox,
         'resolution': grid_resolution}
 p_grid = namedtuple('p_grid', grid)(**grid)
@@ -39,7 +60,7 @@ p_grid = namedtuple('p_grid', grid)(**grid)
 # Forces
 zones = ['tail', 'r_hand', 'l_hand', 'r_ear', 'l_ear', 'muzzle']
 centers, radius, amplitude = {}, {}, {}
-for zone, c, rad, amp in zip(zones, find_extremities(mesh, scale), [2.5, 2.5, 2.5, 2., 2., 1.5],
+for zone, c, rad, amp in zip(zones, geometry['extremities'], [2.5, 2.5, 2.5, 2., 2., 1.5],
                              array([15, 2.5, 2.5, 7.5, 7.5, 7.5]) * scale):
     centers[zone] = c
     radius[zone] = scale * rad
@@ -1,5 +1,6 @@
-from vedo import Mesh
-from math import fabs
+from math import fabs, inf
+
+from DeepPhysX.Sofa.Utils.mesh import read_obj, bounding_box, extremity
 
 
 def compute_grid_resolution(max_bbox, min_bbox, cell_size, print_log=False):
@@ -44,15 +45,8 @@ def define_bbox(source_file, margin_scale, scale):
     :return: List of coordinates defined by xmin, ymin, zmin, xmax, ymax, zmax
     """
 
-    # Find min and max corners of the bounding box
-    mesh = Mesh(source_file).scale(scale)
-    bbox_min = mesh.points().min(0)
-    bbox_max = mesh.points().max(0)
-
-    # Apply a margin scale to the bounding box
-    bbox_min -= margin_scale * (bbox_max - bbox_min)
-    bbox_max += margin_scale * (bbox_max - bbox_min)
-
+    # Find min and max corners of the scaled bounding box with a margin
+    bbox_min, bbox_max = bounding_box(read_obj(source_file)['points'], scale=scale, margin_scale=margin_scale)
     return bbox_min, bbox_max, bbox_min.tolist() + bbox_max.tolist()
 
 
@@ -66,32 +60,25 @@ def find_extremities(source_file, scale):
     """
 
     # Get the coordinates of the mesh
-    mesh = Mesh(source_file).scale(scale)
-    coords = mesh.points().copy()
+    coords = read_obj(source_file)['points'] * scale
 
     # Get the size of the bounding box
-    b_min, b_max, _ = define_bbox(source_file, 0, scale)
+    b_min, b_max = bounding_box(coords)
     sizes = b_max - b_min
 
     # Find the tail
-    tail = coords[coords[:, 2].argmax()].tolist()
+    tail = extremity(coords, axis=2).tolist()
 
     # Find the hands
-    right = coords[coords[:, 0] >= sizes[0] / 3]
-    left = coords[coords[:, 0] <= -sizes[0] / 3]
-    r_hand = right[right[:, 2].argmin()].tolist()
-    l_hand = left[left[:, 2].argmin()].tolist()
+    r_hand = extremity(coords, axis=2, maximum=False, box=[sizes[0] / 3, -inf, -inf, inf, inf, inf]).tolist()
+    l_hand = extremity(coords, axis=2, maximum=False, box=[-inf, -inf, -inf, -sizes[0] / 3, inf, inf]).tolist()
 
     # Find the ears
-    right = coords[coords[:, 0] >= 0]
-    left = coords[coords[:, 0] <= 0]
-    r_ear = right[right[:, 1].argmax()].tolist()
-    l_ear = left[left[:, 1].argmax()].tolist()
+    r_ear = extremity(coords, axis=1, box=[0., -inf, -inf, inf, inf, inf]).tolist()
+    l_ear = extremity(coords, axis=1, box=[-inf, -inf, -inf, 0., inf, inf]).tolist()
 
     # Find the muzzle
-    middle = coords[coords[:, 0] >= -sizes[0] / 3]
-    middle = middle[middle[:, 0] <= sizes[0] / 3]
-    muzzle = middle[middle[:, 2].argmin()].tolist()
+    muzzle = extremity(coords, axis=2, maximum=False, box=[-sizes[0] / 3, -inf, -inf, sizes[0] / 3, inf, inf]).tolist()
 
     return [tail, r_hand, l_hand, r_ear, l_ear, muzzle]
 
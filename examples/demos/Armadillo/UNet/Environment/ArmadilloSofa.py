@@ -13,17 +13,18 @@ from numpy import array
 from numpy.random import uniform, choice
 
 # Sofa & Caribou related imports
-import Sofa.Simulation
 import SofaRuntime
+import Sofa.SofaBaseTopology
 from Caribou.Topology import Grid3D
 
 # DeepPhysX related imports
 from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
+from DeepPhysX.Sofa.Utils.cache import hash_file
+from DeepPhysX.Sofa.Utils.grid import sparse_grid_correspondence, GridIncidence
 
 # Session related imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from parameters import p_model, p_grid, p_forces
-from utils import from_sparse_to_regular_grid
 
 
 class ArmadilloSofa(SofaEnvironment):
@@ -48,6 +49,7 @@ class ArmadilloSofa(SofaEnvironment):
         self.idx_sparse_to_regular = None
         self.idx_regular_to_sparse = None
         self.regular_grid_rest_shape = None
+        self.surface_incidence = None
         self.data_size = None
 
         # FEM objects
@@ -120,6 +122,7 @@ class ArmadilloSofa(SofaEnvironment):
         self.f_sparse_grid_topo = self.root.fem.addObject('SparseGridTopology', name='SparseGridTopo',
                                                           src='@../MeshCoarse', n=p_grid.grid_resolution)
         self.f_sparse_grid_mo = self.root.fem.addObject('MechanicalObject', name='SparseGridMO', src='@SparseGridTopo')
+        self.define_checkpoint(mechanical_objects=[self.f_sparse_grid_mo])
 
         # Material
         self.root.fem.addObject('SaintVenantKirchhoffMaterial', name='StVK', young_modulus=1000, poisson_ratio=0.45)
@@ -208,10 +211,22 @@ class ArmadilloSofa(SofaEnvironment):
         sparse_grid_topo = self.f_sparse_grid_topo if self.create_model['fem'] else self.n_sparse_grid_topo
         self.nb_nodes_regular_grid = self.regular_grid.number_of_nodes()
         self.nb_nodes_sparse_grid = len(sparse_grid_mo.rest_position.value)
-        correspondence = from_sparse_to_regular_grid(self.nb_nodes_regular_grid, sparse_grid_topo, sparse_grid_mo)
-        self.idx_sparse_to_regular = correspondence[0]
-        self.idx_regular_to_sparse = correspondence[1]
-        self.regular_grid_rest_shape = correspondence[2]
+        # The correspondences are computed once and memory-mapped from the cache by the other instances
+        parameters = {'mesh': hash_file(p_model.mesh_coarse), 'grid_resolution': p_grid.grid_resolution,
+                      'b_box': p_grid.b_box}
+        correspondence = sparse_grid_correspondence(sparse_grid=sparse_grid_topo, sparse_grid_mo=sparse_grid_mo,
+                                                    nb_nodes_regular_grid=self.nb_nodes_regular_grid,
+                                                    parameters=parameters)
+        self.idx_sparse_to_regular = correspondence['idx_sparse_to_regular']
+        self.idx_regular_to_sparse = correspondence['idx_regular_to_sparse']
+        self.regular_grid_rest_shape = correspondence['regular_grid_rest_shape']
+
+        # Nodes of the regular grid cell containing each surface node at rest, used to encode the forces
+        surface_mo = self.f_surface_mo if self.create_model['fem'] else self.n_surface_mo
+        self.surface_incidence = GridIncidence(
+            rows=[self.regular_grid.node_indices_of(self.regular_grid.cell_index_containing(p))
+                  for p in surface_mo.rest_position.value],
+            nb_nodes_regular_grid=self.nb_nodes_regular_grid)
 
         # Get the data sizes
         self.data_size = (self.nb_nodes_regular_grid, 3)
@@ -260,8 +275,8 @@ class ArmadilloSofa(SofaEnvironment):
         # Check if the solver converged while computing FEM
         if self.create_model['fem']:
             if not self.solver.converged.value:
-                # Reset simulation if solver diverged to avoid unwanted behaviour in following samples
-                Sofa.Simulation.reset(self.root)
+                # Restore the initial state if solver diverged to avoid unwanted behaviour in following samples
+                self.restore_checkpoint()
             return self.solver.converged.value
         return True
 
@@ -270,4 +285,5 @@ class ArmadilloSofa(SofaEnvironment):
         Shutdown procedure.
         """
 
+        SofaEnvironment.close(self)
         print("Bye!")
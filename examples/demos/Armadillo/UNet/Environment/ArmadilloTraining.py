@@ -12,8 +12,7 @@ Training data are produced at each time step :
 # Python related imports
 import os
 import sys
-from numpy import ndarray, zeros, double, subtract, reshape
-from numpy.linalg import norm
+from numpy import ndarray, zeros, subtract
 
 # Session related imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -67,19 +66,11 @@ class ArmadilloTraining(ArmadilloSofa):
         """
 
         # Init encoded force vector to zero
-        F = zeros(self.data_size, dtype=double)
-        # Encode each force field
-        surface_mo = self.f_surface_mo if self.create_model['fem'] else self.n_surface_mo
-        for force_field in self.cff:
-            for i in force_field.indices.value:
-                # Get the list of nodes composing a cell containing a point from the force field
-                p = surface_mo.rest_position.value[i]
-                cell = self.regular_grid.cell_index_containing(p)
-                # For each node of the cell, encode the force value
-                for node in self.regular_grid.node_indices_of(cell):
-                    if node < self.nb_nodes_regular_grid and norm(F[node]) == 0.:
-                        F[node] = force_field.force.value
-        return F
+        F = zeros(self.data_size, dtype=self.dtype)
+        # Encode each force field on the nodes of the cells containing its points, the first force field wins
+        return self.surface_incidence.scatter(sources=[(force_field.indices.value, force_field.force.value)
+                                                       for force_field in self.cff],
+                                              out=F)
 
     def compute_output(self):
         """
@@ -87,16 +78,15 @@ class ArmadilloTraining(ArmadilloSofa):
         """
 
         # Write the position of each point from the sparse grid to the regular grid
-        actual_positions_on_regular_grid = zeros(self.data_size, dtype=double)
+        actual_positions_on_regular_grid = zeros(self.data_size, dtype=self.dtype)
         actual_positions_on_regular_grid[self.idx_sparse_to_regular] = self.f_sparse_grid_mo.position.array()
-        return subtract(actual_positions_on_regular_grid, self.regular_grid_rest_shape)
+        return subtract(actual_positions_on_regular_grid, self.regular_grid_rest_shape,
+                        out=actual_positions_on_regular_grid)
 
     def apply_prediction(self, prediction):
         """
         Apply the predicted displacement to the NN model, update visualization data.
         """
 
-        # Reshape to correspond regular grid, transform to sparse grid
-        U = reshape(prediction['prediction'], self.data_size)
-        U_sparse = U[self.idx_sparse_to_regular]
-        self.n_sparse_grid_mo.position.value = self.n_sparse_grid_mo.rest_position.array() + U_sparse
+        # Write the predicted displacement of the regular grid nodes in the sparse grid in place
+        self.apply_displacement(self.n_sparse_grid_mo, prediction['prediction'], indices=self.idx_sparse_to_regular)
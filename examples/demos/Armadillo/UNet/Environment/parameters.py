@@ -11,18 +11,44 @@ import sys
 from numpy import array
 from collections import namedtuple
 
+from DeepPhysX.Sofa.Utils.cache import cached_values
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils import define_bbox, compute_grid_resolution, find_fixed_box, find_extremities, get_nb_nodes, \
-    get_object_max_size
 
 # Model
 mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/armadillo.obj'
 coarse_mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/armadillo_coarse.obj'
 scale = 1e-3
 scale3d = 3 * [scale]
-size = get_object_max_size(mesh, scale)
-fixed_box = find_fixed_box(mesh, scale)
-nb_nodes = get_nb_nodes(coarse_mesh)
+cell_size = 0.06
+utils_file = os.path.dirname(os.path.abspath(__file__)) + '/utils.py'
+
+
+def compute_geometry():
+    """
+    Compute the parameters derived from the geometry of the meshes.
+    """
+
+    from utils import define_bbox, compute_grid_resolution, find_fixed_box, find_extremities, get_nb_nodes, \
+        get_object_max_size
+    min_bbox, max_bbox, b_box = define_bbox(mesh, 0., scale)
+    return {'size': get_object_max_size(mesh, scale),
+            'fixed_box': find_fixed_box(mesh, scale),
+            'nb_nodes': get_nb_nodes(coarse_mesh),
+            'min_bbox': min_bbox,
+            'max_bbox': max_bbox,
+            'b_box': b_box,
+            'grid_resolution': compute_grid_resolution(max_bbox, min_bbox, cell_size),
+            'extremities': find_extremities(mesh, scale)}
+
+
+# Geometry is computed once per mesh content, then read from the cache
+geometry = cached_values(name='Armadillo.UNet', compute=compute_geometry,
+                         files=[mesh, coarse_mesh, utils_file],
+                         scale=scale, cell_size=cell_size)
+size = geometry['size']
+fixed_box = geometry['fixed_box']
+nb_nodes = geometry['nb_nodes']
 model = {'mesh': mesh,
          'mesh_coarse': coarse_mesh,
          'scale': scale,
@@ -33,10 +59,9 @@ model = {'mesh': mesh,
 p_model = namedtuple('p_model', model)(**model)
 
 # Grid
-cell_size = 0.06
-min_bbox, max_bbox, b_box = define_bbox(mesh, 0., scale)
+min_bbox, max_bbox, b_box = geometry['min_bbox'], geometry['max_bbox'], geometry['b_box']
 bbox_size = max_bbox - min_bbox
-grid_resolution = compute_grid_resolution(max_bbox, min_bbox, cell_size)
+grid_resolution = geometry['grid_resolution']
 nb_cells = [g_r - 1 for g_r in grid_resolution]
 grid = {'b_box': b_box,
         'bbox_anchor': min_bbox.tolist(),
@@ -48,7 +73,7 @@ p_grid = namedtuple('p_grid', grid)(**grid)
 # Forces
 zones = ['tail', 'r_hand', 'l_hand', 'r_ear', 'l_ear', 'muzzle']
 centers, radius, amplitude = {}, {}, {}
-for zone, c, rad, amp in zip(zones, find_extremities(mesh, scale), [2.5, 2.5, 2.5, 2., 2., 1.5],
+for zone, c, rad, amp in zip(zones, geometry['extremities'], [2.5, 2.5, 2.5, 2., 2., 1.5],
                              array([15, 2.5, 2.5, 7.5, 7.5, 7.5]) * scale):
     centers[zone] = c
     radius[zone] = scale * rad
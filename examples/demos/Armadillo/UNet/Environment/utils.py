@@ -1,8 +1,8 @@
-from vedo import Mesh
-from math import fabs
-import numpy as np
+from math import fabs, inf
 import Sofa.SofaBaseTopology
 
+from DeepPhysX.Sofa.Utils.mesh import read_obj, bounding_box, extremity
+
 
 def find_fixed_box(source_file, scale):
     """
@@ -37,32 +37,25 @@ def find_extremities(source_file, scale):
     """
 
     # Get the coordinates of the mesh
-    mesh = Mesh(source_file).scale(scale)
-    coords = mesh.points().copy()
+    coords = read_obj(source_file)['points'] * scale
 
     # Get the size of the bounding box
-    b_min, b_max, _ = define_bbox(source_file, 0, scale)
+    b_min, b_max = bounding_box(coords)
     sizes = b_max - b_min
 
     # Find the tail
-    tail = coords[coords[:, 2].argmax()].tolist()
+    tail = extremity(coords, axis=2).tolist()
 
     # Find the hands
-    right = coords[coords[:, 0] >= sizes[0] / 3]
-    left = coords[coords[:, 0] <= -sizes[0] / 3]
-    r_hand = right[right[:, 2].argmin()].tolist()
-    l_hand = left[left[:, 2].argmin()].tolist()
+    r_hand = extremity(coords, axis=2, maximum=False, box=[sizes[0] / 3, -inf, -inf, inf, inf, inf]).tolist()
+    l_hand = extremity(coords, axis=2, maximum=False, box=[-inf, -inf, -inf, -sizes[0] / 3, inf, inf]).tolist()
 
     # Find the ears
-    right = coords[coords[:, 0] >= 0]
-    left = coords[coords[:, 0] <= 0]
-    r_ear = right[right[:, 1].argmax()].tolist()
-    l_ear = left[left[:, 1].argmax()].tolist()
+    r_ear = extremity(coords, axis=1, box=[0., -inf, -inf, inf, inf, inf]).tolist()
+    l_ear = extremity(coords, axis=1, box=[-inf, -inf, -inf, 0., inf, inf]).tolist()
 
     # Find the muzzle
-    middle = coords[coords[:, 0] >= -sizes[0] / 3]
-    middle = middle[middle[:, 0] <= sizes[0] / 3]
-    muzzle = middle[middle[:, 2].argmin()].tolist()
+    muzzle = extremity(coords, axis=2, maximum=False, box=[-sizes[0] / 3, -inf, -inf, sizes[0] / 3, inf, inf]).tolist()
 
     return [tail, r_hand, l_hand, r_ear, l_ear, muzzle]
 
@@ -77,15 +70,8 @@ def define_bbox(source_file, margin_scale, scale):
     :return: List of coordinates defined by xmin, ymin, zmin, xmax, ymax, zmax
     """
 
-    # Find min and max corners of the bounding box
-    mesh = Mesh(source_file).scale(scale)
-    bbox_min = mesh.points().min(0)
-    bbox_max = mesh.points().max(0)
-
-    # Apply a margin scale to the bounding box
-    bbox_min -= margin_scale * (bbox_max - bbox_min)
-    bbox_max += margin_scale * (bbox_max - bbox_min)
-
+    # Find min and max corners of the scaled bounding box with a margin
+    bbox_min, bbox_max = bounding_box(read_obj(source_file)['points'], scale=scale, margin_scale=margin_scale)
     return bbox_min, bbox_max, bbox_min.tolist() + bbox_max.tolist()
 
 
@@ -129,7 +115,7 @@ def get_nb_nodes(source_file):
     :return: Number of nodes in the mesh
     """
 
-    return Mesh(source_file).N()
+    return len(read_obj(source_file)['points'])
 
 
 def get_object_max_size(source_file, scale):
@@ -141,35 +127,5 @@ def get_object_max_size(source_file, scale):
     :return: Max size of the object
     """
 
-    b = Mesh(source_file).scale(scale).bounds()
-    return max(b[1]-b[0], b[3]-b[2], b[5]-b[4])
-
-
-def from_sparse_to_regular_grid(nb_nodes_regular_grid, sparse_grid, sparse_grid_mo):
-    """
-    Map the indices of nodes in the sparse grid with the indices of nodes in the regular grid.
-
-    :param int nb_nodes_regular_grid: Total number of nodes in the regular grid
-    :param sparse_grid: SparseGridTopology containing the sparse grid topology
-    :param sparse_grid_mo: MechanicalObject containing the positions of the nodes in the sparse grid
-    :return: Mapped indices from sparse to regular grids, Mapped indices from regular to sparse regular grid,
-    Rest shape positions of the regular grid
-    """
-
-    # Initialize mapping between sparse grid and regular grid
-    positions_sparse_grid = sparse_grid_mo.position.array()
-    indices_sparse_to_regular = np.zeros(positions_sparse_grid.shape[0], dtype=np.int32)
-    indices_regular_to_sparse = np.full(nb_nodes_regular_grid, -1, dtype=np.int32)
-
-    # Map the indices of each node iteratively
-    for i in range(positions_sparse_grid.shape[0]):
-        # In Sofa, a SparseGrid in computed from a RegularGrid, just use the dedicated method to retrieve their link
-        idx = sparse_grid.getRegularGridNodeIndex(i)
-        indices_sparse_to_regular[i] = idx  # Node i in SparseGrid corresponds to node idx in RegularGrid
-        indices_regular_to_sparse[idx] = i  # Node idx in RegularGrid corresponds to node i in SparseGrid
-
-    # Recover rest shape positions of sparse grid nodes in the regular grid
-    regular_grid_rest_shape_positions = np.zeros((nb_nodes_regular_grid, 3), dtype=np.double)
-    regular_grid_rest_shape_positions[indices_sparse_to_regular] = sparse_grid_mo.rest_position.array()
-
-    return indices_sparse_to_regular, indices_regular_to_sparse, regular_grid_rest_shape_positions
+    b_min, b_max = bounding_box(read_obj(source_file)['points'], scale=scale)
+    return (b_max - b_min).max()
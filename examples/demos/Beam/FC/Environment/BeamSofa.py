@@ -13,7 +13,6 @@ from numpy.random import randint, uniform
 from numpy.linalg import norm
 
 # Sofa related imports
-import Sofa.Simulation
 import SofaRuntime
 
 # DeepPhysX related imports
@@ -94,6 +93,7 @@ class BeamSofa(SofaEnvironment):
         self.root.fem.addObject('RegularGridTopology', name='GridTopo', min=p_grid.min.tolist(),
                                 max=p_grid.max.tolist(), nx=p_grid.res[0], ny=p_grid.res[1], nz=p_grid.res[2])
         self.f_grid_mo = self.root.fem.addObject('MechanicalObject', name='GridMO', src='@GridTopo', showObject=False)
+        self.define_checkpoint(mechanical_objects=[self.f_grid_mo])
         self.root.fem.addObject('HexahedronSetTopologyContainer', name='HexaTopo', src='@GridTopo')
         self.root.fem.addObject('HexahedronSetGeometryAlgorithms', template='Vec3d')
         self.root.fem.addObject('HexahedronSetTopologyModifier')
@@ -235,8 +235,8 @@ class BeamSofa(SofaEnvironment):
         # Check if the solver converged while computing FEM
         if self.create_model['fem']:
             if not self.solver.converged.value:
-                # Reset simulation if solver diverged to avoid unwanted behaviour in following samples
-                Sofa.Simulation.reset(self.root)
+                # Restore the initial state if solver diverged to avoid unwanted behaviour in following samples
+                self.restore_checkpoint()
             return self.solver.converged.value
         return True
 
@@ -245,4 +245,5 @@ class BeamSofa(SofaEnvironment):
         Shutdown procedure.
         """
 
+        SofaEnvironment.close(self)
         print("Bye!")
@@ -12,7 +12,7 @@ Training data are produced at each time step :
 # Python related imports
 import os
 import sys
-from numpy import ndarray, zeros, reshape
+from numpy import ndarray, zeros
 
 # Session related imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -41,6 +41,10 @@ class BeamTraining(BeamSofa):
         # Define the fields of the Training database
         self.define_training_fields(fields=[('input', ndarray), ('ground_truth', ndarray)])
 
+        # The ground truth is the displacement of the FEM grid
+        if self.create_model['fem']:
+            self.bind_training_field(field='ground_truth', mechanical_object='@fem.GridMO', quantity='displacement')
+
     def init_visualization(self):
         """
         Define and send the initial visualization data dictionary. Automatically called when creating Environment.
@@ -56,9 +60,8 @@ class BeamTraining(BeamSofa):
         Called within the Sofa pipeline at the end of the time step. Compute training data.
         """
 
-        # Send training data
-        self.set_training_data(input=self.compute_input(),
-                               ground_truth=self.compute_output())
+        # Send training data (the ground truth is bound to the FEM grid displacement)
+        self.set_training_data(input=self.compute_input())
 
     def compute_input(self):
         """
@@ -84,6 +87,5 @@ class BeamTraining(BeamSofa):
         Apply the predicted displacement to the NN model.
         """
 
-        # Reshape to correspond regular grid
-        U = reshape(prediction['prediction'], self.data_size)
-        self.n_grid_mo.position.value = self.n_grid_mo.rest_position.array() + U
+        # Write the predicted displacement of the regular grid in place
+        self.apply_displacement(self.n_grid_mo, prediction['prediction'])
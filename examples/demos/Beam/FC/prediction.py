@@ -9,9 +9,6 @@ Use 'python3 validation.py -v' to render predictions with Vedo.
 import os
 import sys
 
-# Sofa related imports
-import Sofa.Gui
-
 # DeepPhysX related imports
 from DeepPhysX.Core.Database.BaseDatabaseConfig import BaseDatabaseConfig
 from DeepPhysX.Core.Pipelines.BasePrediction import BasePrediction
@@ -91,7 +88,8 @@ if __name__ == '__main__':
         # Create SOFA runner
         runner = create_runner()
 
-        # Launch SOFA GUI
+        # Launch SOFA GUI, only imported here so that create_runner can be used without GUI
+        import Sofa.Gui
         Sofa.Gui.GUIManager.Init("main", "qglviewer")
         Sofa.Gui.GUIManager.createGUI(runner.root, __file__)
         Sofa.Gui.GUIManager.SetDimension(1080, 1080)
@@ -13,7 +13,6 @@ from numpy.random import randint, uniform
 from numpy.linalg import norm
 
 # Sofa related imports
-import Sofa.Simulation
 import SofaRuntime
 
 # DeepPhysX related imports
@@ -99,6 +98,7 @@ class BeamSofa(SofaEnvironment):
                                                    max=p_grid.max.tolist(), nx=p_grid.res[0], ny=p_grid.res[1],
                                                    nz=p_grid.res[2])
         self.f_grid_mo = self.root.fem.addObject('MechanicalObject', name='GridMO', src='@GridTopo', showObject=False)
+        self.define_checkpoint(mechanical_objects=[self.f_grid_mo])
         self.root.fem.addObject('HexahedronSetTopologyContainer', name='HexaTopo', src='@GridTopo')
         self.root.fem.addObject('HexahedronSetGeometryAlgorithms', template='Vec3d')
         self.root.fem.addObject('HexahedronSetTopologyModifier')
@@ -243,8 +243,8 @@ class BeamSofa(SofaEnvironment):
         # Check if the solver converged while computing FEM
         if self.create_model['fem']:
             if not self.solver.converged.value:
-                # Reset simulation if solver diverged to avoid unwanted behaviour in following samples
-                Sofa.Simulation.reset(self.root)
+                # Restore the initial state if solver diverged to avoid unwanted behaviour in following samples
+                self.restore_checkpoint()
             return self.solver.converged.value
         return True
 
@@ -253,4 +253,5 @@ class BeamSofa(SofaEnvironment):
         Shutdown procedure.
         """
 
+        SofaEnvironment.close(self)
         print("Bye!")
@@ -11,7 +11,6 @@ import os
 import sys
 
 # Sofa & Caribou related imports
-import Sofa.Simulation
 import SofaRuntime
 
 # DeepPhysX related imports
@@ -96,6 +95,7 @@ class LiverSofa(SofaEnvironment):
                                 n=p_grid.resolution)
         self.f_sparse_grid_mo = self.root.fem.addObject('MechanicalObject', name='SparseGridMO', src='@SparseGridTopo',
                                                         showObject=False)
+        self.define_checkpoint(mechanical_objects=[self.f_sparse_grid_mo])
 
         # Material
         self.root.fem.addObject('NeoHookeanMaterial', name='NH', young_modulus=4000, poisson_ratio=0.4)
@@ -233,8 +233,8 @@ class LiverSofa(SofaEnvironment):
         # Check if the solver converged while computing FEM
         if self.create_model['fem']:
             if not self.solver.converged.value:
-                # Reset simulation if solver diverged to avoid unwanted behaviour in following samples
-                Sofa.Simulation.reset(self.root)
+                # Restore the initial state if solver diverged to avoid unwanted behaviour in following samples
+                self.restore_checkpoint()
             return self.solver.converged.value
         return True
 
@@ -243,4 +243,5 @@ class LiverSofa(SofaEnvironment):
         Shutdown procedure.
         """
 
+        SofaEnvironment.close(self)
         print("Bye!")
@@ -12,7 +12,7 @@ Training data are produced at each time step :
 # Python related imports
 import os
 import sys
-from numpy import ndarray, zeros, reshape
+from numpy import ndarray, zeros
 
 # Session related imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -95,6 +95,5 @@ class LiverTraining(LiverSofa):
         Apply the predicted displacement to the NN model.
         """
 
-        # Reshape to correspond sparse grid
-        U = reshape(prediction['prediction'], self.output_size)
-        self.n_sparse_grid_mo.position.value = self.n_sparse_grid_mo.rest_position.array() + U
+        # Write the predicted displacement of the sparse grid in place
+        self.apply_displacement(self.n_sparse_grid_mo, prediction['prediction'])
@@ -1,9 +1,11 @@
 import os
 import sys
+import numpy as np
 from collections import namedtuple
 
+from DeepPhysX.Sofa.Utils.cache import cached_values
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils import np, compute_grid_resolution, find_boundaries, define_bbox, get_nb_nodes, find_center
 
 # Liver parameters
 mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/liver.obj'
@@ -11,9 +13,32 @@ mesh_coarse = os.path.dirname(os.path.abspath(__file__)) + '/models/liver_coarse
 boundary_files = [os.path.dirname(os.path.abspath(__file__)) + '/models/vein.obj']
 scale = 1e-3
 scale3d = np.array([scale, scale, scale])
-fixed_box = find_boundaries(mesh, boundary_files, scale3d)
-fixed_point = find_center(mesh, scale)
-nb_nodes = get_nb_nodes(mesh_coarse)
+margin_scale = 0.1
+cell_size = 0.06
+utils_file = os.path.dirname(os.path.abspath(__file__)) + '/utils.py'
+
+
+def compute_geometry():
+    """
+    Compute the parameters derived from the geometry of the meshes.
+    """
+
+    from utils import compute_grid_resolution, find_boundaries, define_bbox, get_nb_nodes, find_center
+    min_bbox, max_bbox, b_box = define_bbox(mesh, margin_scale, scale3d)
+    return {'fixed_box': find_boundaries(mesh, boundary_files, scale3d),
+            'fixed_point': find_center(mesh, scale),
+            'nb_nodes': get_nb_nodes(mesh_coarse),
+            'b_box': b_box,
+            'grid_resolution': compute_grid_resolution(max_bbox, min_bbox, cell_size)}
+
+
+# Geometry is computed once per mesh content, then read from the cache
+geometry = cached_values(name='Liver.FC', compute=compute_geometry,
+                         files=[mesh, mesh_coarse, utils_file] + boundary_files,
+                         scale=scale, margin_scale=margin_scale, cell_size=cell_size)
+fixed_box = geometry['fixed_box']
+fixed_point = geometry['fixed_point']
+nb_nodes = geometry['nb_nodes']
 model = {'mesh': mesh,
          'mesh_coarse': mesh_coarse,
          'scale': scale,
@@ -24,10 +49,8 @@ model = {'mesh': mesh,
 p_model = namedtuple('p_liver', model)(**model)
 
 # Grid parameters
-margin_scale = 0.1
-min_bbox, max_bbox, b_box = define_bbox(mesh, margin_scale, scale3d)
-cell_size = 0.06
-grid_resolution = compute_grid_resolution(max_bbox, min_bbox, cell_size)
+b_box = geometry['b_box']
+grid_resolution = geometry['grid_resolution']
 grid = {'bbox': b_box,
         'resolution': grid_resolution}
 p_grid = namedtuple('p_grid', grid)(**grid)
@@ -1,10 +1,11 @@
 import math
-import vedo
 import os
 os.environ['OPENBLAS_NUM_THREADS'] = '1'
 os.environ['MKL_NUM_THREADS'] = '1'
 import numpy as np
 
+from DeepPhysX.Sofa.Utils.mesh import read_obj, bounding_box, center_of_mass
+
 
 def compute_grid_resolution(max_bbox, min_bbox, cell_size):
     """
@@ -41,6 +42,7 @@ def find_boundaries(source_file, objects_files_list, scale):
     """
 
     # Source mesh object, list of points defining the boundary conditions
+    import vedo
     source_mesh = vedo.Mesh(source_file)
     boundaries = []
 
@@ -66,17 +68,8 @@ def define_bbox(source_file, margin_scale, scale):
     :return: Boundary box defined by [xmin, ymin, zmin, xmax, ymax, zmax]
     """
 
-    # Source object mesh
-    source_mesh = vedo.Mesh(source_file)
-    # Find min and max corners of the bounding box
-    bbox_min = source_mesh.points().min(0)
-    bbox_max = source_mesh.points().max(0)
-    # Apply a margin scale to the bounding box
-    bbox_min -= margin_scale * (bbox_max - bbox_min)
-    bbox_max += margin_scale * (bbox_max - bbox_min)
-    # Scale the bounding box
-    bbox_min = bbox_min * scale
-    bbox_max = bbox_max * scale
+    # Find min and max corners of the scaled bounding box with a margin
+    bbox_min, bbox_max = bounding_box(read_obj(source_file)['points'], scale=scale, margin_scale=margin_scale)
     return bbox_min, bbox_max, bbox_min.tolist() + bbox_max.tolist()
 
 
@@ -88,7 +81,7 @@ def get_nb_nodes(source_file):
     :return: Number of node
     """
 
-    return vedo.Mesh(source_file).N()
+    return len(read_obj(source_file)['points'])
 
 
 def find_center(source_file, scale):
@@ -100,4 +93,4 @@ def find_center(source_file, scale):
     :return: Center of mass of the object
     """
 
-    return vedo.Mesh(source_file).scale(scale).centerOfMass()
+    return center_of_mass(read_obj(source_file)['points'], scale=scale)
@@ -3,8 +3,9 @@ import sys
 from numpy import array
 from collections import namedtuple
 
+from DeepPhysX.Sofa.Utils.cache import cached_values
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from utils import compute_grid_resolution, find_boundaries, define_bbox, get_nb_nodes, find_center
 
 # Liver
 mesh = os.path.dirname(os.path.abspath(__file__)) + '/models/liver.obj'
@@ -12,9 +13,33 @@ mesh_coarse = os.path.dirname(os.path.abspath(__file__)) + '/models/liver_coarse
 boundary_files = [os.path.dirname(os.path.abspath(__file__)) + '/models/vein.obj']
 scale = 1e-3
 scale3d = array([scale, scale, scale])
-fixed_box = find_boundaries(mesh, boundary_files, scale3d)
-fixed_point = find_center(mesh, scale)
-nb_nodes = get_nb_nodes(mesh_coarse)
+cell_size = 0.06
+utils_file = os.path.dirname(os.path.abspath(__file__)) + '/utils.py'
+
+
+def compute_geometry():
+    """
+    Compute the parameters derived from the geometry of the meshes.
+    """
+
+    from utils import compute_grid_resolution, find_boundaries, define_bbox, get_nb_nodes, find_center
+    min_bbox, max_bbox, b_box = define_bbox(mesh, 0., scale3d)
+    return {'fixed_box': find_boundaries(mesh, boundary_files, scale3d),
+            'fixed_point': find_center(mesh, scale),
+            'nb_nodes': get_nb_nodes(mesh_coarse),
+            'min_bbox': min_bbox,
+            'max_bbox': max_bbox,
+            'b_box': b_box,
+            'grid_resolution': compute_grid_resolution(max_bbox, min_bbox, cell_size)}
+
+
+# Geometry is computed once per mesh content, then read from the cache
+geometry = cached_values(name='Liver.UNet', compute=compute_geometry,
+                         files=[mesh, mesh_coarse, utils_file] + boundary_files,
+                         scale=scale, cell_size=cell_size)
+fixed_box = geometry['fixed_box']
+fixed_point = geometry['fixed_point']
+nb_nodes = geometry['nb_nodes']
 liver = {'mesh': mesh,
          'mesh_coarse': mesh_coarse,
          'scale': scale,
@@ -25,10 +50,9 @@ liver = {'mesh': mesh,
 p_liver = namedtuple('p_liver', liver)(**liver)
 
 # Grid parameters
-min_bbox, max_bbox, b_box = define_bbox(mesh, 0., scale3d)
+min_bbox, max_bbox, b_box = geometry['min_bbox'], geometry['max_bbox'], geometry['b_box']
 bbox_size = max_bbox - min_bbox
-cell_size = 0.06
-grid_resolution = compute_grid_resolution(max_bbox, min_bbox, cell_size)
+grid_resolution = geometry['grid_resolution']
 nb_cells = [g_r - 1 for g_r in grid_resolution]
 grid = {'b_box': b_box,
         'bbox_anchor': min_bbox.tolist(),
@@ -1,11 +1,12 @@
 import math
-import vedo
 import os
 os.environ['OPENBLAS_NUM_THREADS'] = '1'
 os.environ['MKL_NUM_THREADS'] = '1'
 import numpy as np
 import Sofa.SofaBaseTopology
 
+from DeepPhysX.Sofa.Utils.mesh import read_obj, bounding_box, center_of_mass
+
 
 def compute_grid_resolution(max_bbox, min_bbox, cell_size, print_log=False):
     """
@@ -47,6 +48,7 @@ def find_boundaries(source_file, objects_files_list, scale):
     :return: List of boxes defined by xmin,ymin,zmin, xmax,ymax,zmax
     """
     # Source mesh object, list of points defining the boundary conditions
+    import vedo
     source_mesh = vedo.Mesh(source_file)
     boundaries = []
     # Find intersections for each object
@@ -68,54 +70,14 @@ def define_bbox(source_file, margin_scale, scale):
     :param margin_scale: Margin in percents
     :return: List of boxes defined by xmin,ymin,zmin, xmax,ymax,zmax
     """
-    # Source object mesh
-    source_mesh = vedo.Mesh(source_file)
-    # Find min and max corners of the bounding box
-    bbox_min = source_mesh.points().min(0)
-    bbox_max = source_mesh.points().max(0)
-    # Apply a margin scale to the bounding box
-    bbox_min -= margin_scale * (bbox_max - bbox_min)
-    bbox_max += margin_scale * (bbox_max - bbox_min)
-    # Scale the bounding box
-    bbox_min = bbox_min * scale
-    bbox_max = bbox_max * scale
+    # Find min and max corners of the scaled bounding box with a margin
+    bbox_min, bbox_max = bounding_box(read_obj(source_file)['points'], scale=scale, margin_scale=margin_scale)
     return bbox_min, bbox_max, bbox_min.tolist() + bbox_max.tolist()
 
 
 def get_nb_nodes(source_file):
-    mesh = vedo.Mesh(source_file)
-    return len(mesh.points())
+    return len(read_obj(source_file)['points'])
 
 
 def find_center(source_file, scale):
-    return vedo.Mesh(source_file).scale(scale).centerOfMass()
-
-
-def from_sparse_to_regular_grid(nb_nodes_regular_grid, sparse_grid, sparse_grid_mo):
-    """
-    Map the indices of nodes in the sparse grid with the indices of nodes in the regular grid.
-
-    :param int nb_nodes_regular_grid: Total number of nodes in the regular grid
-    :param sparse_grid: SparseGridTopology containing the sparse grid topology
-    :param sparse_grid_mo: MechanicalObject containing the positions of the nodes in the sparse grid
-    :return: Mapped indices from sparse to regular grids, Mapped indices from regular to sparse regular grid,
-    Rest shape positions of the regular grid
-    """
-
-    # Initialize mapping between sparse grid and regular grid
-    positions_sparse_grid = sparse_grid_mo.position.array()
-    indices_sparse_to_regular = np.zeros(positions_sparse_grid.shape[0], dtype=np.int32)
-    indices_regular_to_sparse = np.full(nb_nodes_regular_grid, -1, dtype=np.int32)
-
-    # Map the indices of each node iteratively
-    for i in range(positions_sparse_grid.shape[0]):
-        # In Sofa, a SparseGrid in computed from a RegularGrid, just use the dedicated method to retrieve their link
-        idx = sparse_grid.getRegularGridNodeIndex(i)
-        indices_sparse_to_regular[i] = idx  # Node i in SparseGrid corresponds to node idx in RegularGrid
-        indices_regular_to_sparse[idx] = i  # Node idx in RegularGrid corresponds to node i in SparseGrid
-
-    # Recover rest shape positions of sparse grid nodes in the regular grid
-    regular_grid_rest_shape_positions = np.zeros((nb_nodes_regular_grid, 3), dtype=np.double)
-    regular_grid_rest_shape_positions[indices_sparse_to_regular] = sparse_grid_mo.rest_position.array()
-
-    return indices_sparse_to_regular, indices_regular_to_sparse, regular_grid_rest_shape_positions
+    return center_of_mass(read_obj(source_file)['points'], scale=scale)
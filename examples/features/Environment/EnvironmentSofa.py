@@ -92,5 +92,6 @@ class EnvironmentSofa(SofaEnvironment):
 
     def close(self):
 
+        SofaEnvironment.close(self)
         # Shutdown message
         print("Bye!")
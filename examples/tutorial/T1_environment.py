@@ -108,4 +108,5 @@ class DummyEnvironment(SofaEnvironment):
     # Optional
     def close(self):
         # Shutdown procedure
+        SofaEnvironment.close(self)
         print("Bye!")
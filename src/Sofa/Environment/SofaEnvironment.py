@@ -1,5 +1,9 @@
-from typing import Dict, Any, Union, Tuple
-from numpy import ndarray
+from typing import Dict, Any, Union, Tuple, Optional, List
+from threading import get_ident
+from time import perf_counter
+from asyncio import wrap_future
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from numpy import ndarray, asarray, dtype, empty, zeros, add, subtract, take, copyto, issubdtype, floating
 
 from SSD.SOFA.Rendering.UserAPI import UserAPI, Database
 
@@ -35,6 +39,38 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
                                  **kwargs)
         self.root.addObject(self)
 
+        # Number of fused animation steps per DeepPhysX step (set by SofaEnvironmentConfig)
+        self.simulations_per_step: int = 1
+        self.__substep_stats: Dict[str, float] = {'nb_steps': 0, 'nb_substeps': 0,
+                                                  'step_time': 0., 'animate_time': 0.}
+
+        # Training fields bound to MechanicalObjects Data
+        self.__bindings: Dict[str, Dict[str, Any]] = {}
+        self.__pending_training_data: Dict[str, ndarray] = {}
+        self.__stepping: bool = False
+
+        # Last training data set in the Environment
+        self.__last_training_data: Dict[str, Any] = {}
+
+        # Precision of the floating point training data (set by SofaEnvironmentConfig)
+        self.dtype: dtype = dtype('float64')
+        self.__cast_buffers: Dict[str, ndarray] = {}
+
+        # Scratch arrays of the prediction writers
+        self.__scratch: Dict[Tuple[int, str], ndarray] = {}
+
+        # Line of a sample already read from the Database
+        self.__read_line: Optional[List[int]] = None
+
+        # Mechanical state checkpoint (MechanicalObject, state vector, saved values)
+        self.__checkpoint: List[List[Any]] = []
+
+        # Pipelined stepping (set by SofaEnvironmentConfig)
+        self.pipelined: bool = False
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__next_step: Optional[Future] = None
+        self.__worker_id: Optional[int] = None
+
     ##########################################################################################
     ##########################################################################################
     #                                 Environment initialization                             #
@@ -57,6 +93,14 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
         # Init the root node
         Sofa.Simulation.init(self.root)
 
+        # The sub-steps are fused in step, the EnvironmentManager only requests a single step per sample
+        if self.environment_manager is not None:
+            self.environment_manager.simulations_per_step = 1
+
+        # Save the initial mechanical state
+        if len(self.__checkpoint) > 0:
+            self.save_checkpoint()
+
     def init_database(self) -> None:
         """
         Define the fields of the training dataset. Automatically called when Environment is launched.
@@ -73,6 +117,48 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
 
         pass
 
+    def bind_training_field(self,
+                            field: str,
+                            mechanical_object: Union[str, Sofa.Core.Object],
+                            quantity: str = 'displacement',
+                            indices: Optional[ndarray] = None,
+                            scatter: Optional[ndarray] = None,
+                            size: Optional[int] = None) -> None:
+        """
+        Bind a training field to a state vector of a MechanicalObject. The field is computed at the end of each step
+        into a reused buffer from views on the Data, then set as training data.
+
+        :param field: Name of the training field.
+        :param mechanical_object: MechanicalObject or its path from the root node (e.g. '@fem.GridMO').
+        :param quantity: State vector to bind, either 'displacement' (position - rest_position), 'position',
+                         'rest_position', 'velocity' or 'force'.
+        :param indices: Indices of the nodes to gather from the MechanicalObject.
+        :param scatter: Indices of the field nodes receiving the gathered nodes (other nodes are set to zero).
+        :param size: Number of nodes of the field if scatter is defined.
+        """
+
+        if quantity not in ['displacement', 'position', 'rest_position', 'velocity', 'force']:
+            raise ValueError(f"[{self.__class__.__name__}] Unknown quantity '{quantity}' for field '{field}'.")
+        if scatter is not None and size is None:
+            raise ValueError(f"[{self.__class__.__name__}] The size of field '{field}' must be defined to scatter "
+                             f"values.")
+        self.__bindings[field] = {'mechanical_object': mechanical_object, 'quantity': quantity, 'indices': indices,
+                                  'scatter': scatter, 'size': size, 'buffers': None}
+
+    def define_checkpoint(self,
+                          mechanical_objects: List[Union[str, Sofa.Core.Object]],
+                          vectors: Optional[List[str]] = None) -> None:
+        """
+        Define the state vectors to save in the mechanical state checkpoints. The initial state is automatically saved
+        once the scene graph is initialized.
+
+        :param mechanical_objects: MechanicalObjects or their paths from the root node (e.g. '@fem.GridMO').
+        :param vectors: State vectors to save, position and velocity by default.
+        """
+
+        vectors = ['position', 'velocity'] if vectors is None else vectors
+        self.__checkpoint = [[mo, vector, None] for mo in mechanical_objects for vector in vectors]
+
     def save_parameters(self, **kwargs) -> None:
         """
         Save a set of parameters in the Database.
@@ -96,10 +182,101 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
     async def step(self):
         """
         Compute the number of steps in the Environment specified by simulations_per_step in EnvironmentConfig.
+        Sub-steps are fused in a single loop: the Environment only listens to the SOFA events (user hooks and training
+        data computation) and awaits on_step during the last sub-step.
+        In pipelined mode, the animation of the next step runs in a dedicated thread once the current sample is sent to
+        the Database, while its index is returned to the TcpIpServer or the EnvironmentManager.
         """
 
-        Sofa.Simulation.animate(self.root, self.root.dt.value)
+        if self.pipelined:
+            await self.__pipelined_step()
+        else:
+            self.__stepping = True
+            try:
+                self._animate()
+                await self.on_step()
+            finally:
+                self.__stepping = False
+            self.__flush_training_data()
+
+    async def __pipelined_step(self):
+        """
+        Pipelined step: wait for the animation started in the background thread once the previous sample was sent, or
+        run it if the previous sample was discarded. The sample is then checked on a still scene.
+        """
+
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.__class__.__name__)
+        if self.__next_step is None:
+            self.__next_step = self.__executor.submit(self.__animate_in_background)
+        # The event loop may change between steps
+        try:
+            await wrap_future(self.__next_step)
+        finally:
+            self.__next_step = None
         await self.on_step()
+        self.__flush_training_data()
+
+    def __animate_in_background(self) -> None:
+        """
+        Animate the scene in the background thread.
+        """
+
+        self.__worker_id = get_ident()
+        self._animate()
+
+    def __start_next_step(self) -> None:
+        """
+        Start the animation of the next step in the background thread once the current sample is reset.
+        """
+
+        if self.pipelined and self.__executor is not None and self.__next_step is None:
+            self.__next_step = self.__executor.submit(self.__animate_in_background)
+
+    def _stop_pipeline(self) -> None:
+        """
+        Wait for the animation running in the background thread and discard the sample it computed.
+        """
+
+        if self.__next_step is not None:
+            if not self.__next_step.cancel():
+                wait([self.__next_step])
+            self.__next_step = None
+            self.__pending_training_data = {}
+
+    def _animate(self) -> None:
+        """
+        Run the fused sub-steps of a step.
+        """
+
+        dt = self.root.dt.value
+        step_start = perf_counter()
+        animate_time = 0.
+
+        # Intermediate sub-steps: SOFA events are not forwarded to the Environment
+        if self.simulations_per_step > 1:
+            compute_training_data = self.compute_training_data
+            self.compute_training_data = False
+            self._set_listening(False)
+            try:
+                for _ in range(self.simulations_per_step - 1):
+                    start = perf_counter()
+                    Sofa.Simulation.animate(self.root, dt)
+                    animate_time += perf_counter() - start
+            finally:
+                self._set_listening(True)
+                self.compute_training_data = compute_training_data
+
+        # Last sub-step: user hooks are triggered
+        start = perf_counter()
+        Sofa.Simulation.animate(self.root, dt)
+        animate_time += perf_counter() - start
+
+        # Update the sub-steps statistics
+        self.__substep_stats['nb_steps'] += 1
+        self.__substep_stats['nb_substeps'] += self.simulations_per_step
+        self.__substep_stats['step_time'] += perf_counter() - step_start
+        self.__substep_stats['animate_time'] += animate_time
 
     async def on_step(self):
         """
@@ -133,10 +310,13 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
     def close(self) -> None:
         """
         Close the Environment. Automatically called when Environment is shut down.
-        Not mandatory.
+        Not mandatory. The pipelined stepping is stopped here, overriding methods should call SofaEnvironment.close.
         """
 
-        pass
+        self._stop_pipeline()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
 
     ##########################################################################################
     ##########################################################################################
@@ -144,15 +324,192 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
     ##########################################################################################
     ##########################################################################################
 
+    def set_training_data(self, **kwargs) -> None:
+        """
+        Set the training data to send to the TcpIpServer or the EnvironmentManager. If some training fields are bound
+        to MechanicalObjects, data are set with the bound fields at the end of the step when called during a step, right
+        away otherwise (e.g. when the scene is animated by SofaPrediction).
+        """
+
+        self.__pending_training_data.update(kwargs)
+        if not self.pipelined and not (self.__stepping and len(self.__bindings) > 0):
+            self.__flush_training_data()
+
+    def __flush_training_data(self) -> None:
+        """
+        Set the pending training data with the bound training fields.
+        """
+
+        if not self.compute_training_data:
+            self.__pending_training_data = {}
+            return
+        data = {**self._get_bound_data(), **self.__pending_training_data}
+        self.__pending_training_data = {}
+        if len(data) == 0:
+            return
+        self.__set_training_data(**data)
+
+    def __set_training_data(self, **kwargs) -> None:
+        """
+        Set the training data, floating point arrays are converted to the precision of the Environment in reused
+        buffers.
+        """
+
+        for field, value in kwargs.items():
+            if isinstance(value, ndarray) and value.dtype != self.dtype and issubdtype(value.dtype, floating):
+                buffer = self.__cast_buffers.get(field)
+                if buffer is None or buffer.shape != value.shape or buffer.dtype != self.dtype:
+                    buffer = self.__cast_buffers[field] = empty(value.shape, dtype=self.dtype)
+                copyto(buffer, value)
+                kwargs[field] = buffer
+        self.__last_training_data = kwargs
+        BaseEnvironment.set_training_data(self, **kwargs)
+
+    def save_checkpoint(self) -> None:
+        """
+        Save the current mechanical state of the checkpoint MechanicalObjects in preallocated arrays.
+        """
+
+        for entry in self.__checkpoint:
+            if type(entry[0]) == str:
+                entry[0] = self._get_object(entry[0])
+            value = entry[0].getData(entry[1]).array()
+            if entry[2] is None or entry[2].shape != value.shape:
+                entry[2] = empty(value.shape, dtype=value.dtype)
+            copyto(entry[2], value)
+
+    def apply_displacement(self,
+                           mechanical_object: Union[str, Sofa.Core.Object],
+                           displacement: ndarray,
+                           indices: Optional[ndarray] = None) -> None:
+        """
+        Write a predicted displacement in the positions of a MechanicalObject (position = rest_position + displacement).
+        Positions are written in place through a writeable view and gathered nodes are copied in a reused scratch
+        array, so that no array is allocated per call.
+
+        :param mechanical_object: MechanicalObject or its path from the root node (e.g. '@nn.GridMO').
+        :param displacement: Displacement field, reshaped to (nb_nodes, dimension).
+        :param indices: Nodes of the displacement field corresponding to the nodes of the MechanicalObject.
+        """
+
+        if type(mechanical_object) == str:
+            mechanical_object = self._get_object(mechanical_object)
+        rest_position = mechanical_object.rest_position.array()
+        displacement = displacement.reshape((-1, rest_position.shape[1]))
+        if indices is not None:
+            indices = asarray(indices)
+            if len(indices) != len(rest_position):
+                raise ValueError(f"[{self.__class__.__name__}] The number of indices ({len(indices)}) must be the "
+                                 f"number of nodes of the MechanicalObject ({len(rest_position)}).")
+            if len(indices) > 0 and (indices.max() >= len(displacement) or indices.min() < 0):
+                raise ValueError(f"[{self.__class__.__name__}] The indices must be in [0, {len(displacement)}[, the "
+                                 f"number of nodes of the displacement field.")
+            key = (id(mechanical_object), displacement.dtype.str)
+            shape = (len(indices), rest_position.shape[1])
+            if key not in self.__scratch or self.__scratch[key].shape != shape:
+                self.__scratch[key] = empty(shape, dtype=displacement.dtype)
+            # The 'clip' mode avoids the internal buffering of the 'raise' mode, indices were validated above
+            displacement = take(displacement, indices, axis=0, out=self.__scratch[key], mode='clip')
+        with mechanical_object.position.writeableArray() as position:
+            add(rest_position, displacement, out=position)
+
+    def restore_checkpoint(self) -> None:
+        """
+        Restore the mechanical state saved in the last checkpoint, which is much cheaper than resetting the whole scene
+        graph. If no checkpoint was saved, the scene graph is reset.
+        """
+
+        # The state computed by a background animation is outdated
+        self._stop_pipeline()
+        if len(self.__checkpoint) == 0 or self.__checkpoint[0][2] is None:
+            Sofa.Simulation.reset(self.root)
+            return
+        for mo, vector, value in self.__checkpoint:
+            with mo.getData(vector).writeableArray() as array:
+                copyto(array, value)
+
     def get_prediction(self, **kwargs) -> Dict[str, ndarray]:
         """
-        Request a prediction from Network.
+        Request a prediction from Network. In pipelined mode, predictions are not available during the background
+        animation and requests from the main thread wait for its end.
 
         :return: Network prediction.
         """
 
+        if self.__next_step is not None:
+            if get_ident() == self.__worker_id:
+                raise ValueError(f"[{self.__class__.__name__}] Predictions can not be requested by the user hooks "
+                                 f"during a pipelined step.")
+            wait([self.__next_step])
         return BaseEnvironment.get_prediction(self, **kwargs)
 
+    def _reset_training_data(self) -> None:
+        """
+        Reset the training data and the additional data variables. In pipelined mode, the animation of the next step
+        starts once the current sample is sent and reset, so that the user hooks never set data of the next sample
+        in the current one.
+        """
+
+        BaseEnvironment._reset_training_data(self)
+        self.__start_next_step()
+
+    def _get_training_data(self,
+                           line_id: List[int]) -> None:
+        """
+        Get the training data and the additional data from their respective Databases. The Databases are not read
+        again if the line was already set with _set_training_sample.
+
+        :param line_id: Index of the sample to get.
+        """
+
+        if self.__read_line is not None and line_id == self.__read_line:
+            self.__read_line = None
+            return
+        self.__read_line = None
+        BaseEnvironment._get_training_data(self, line_id)
+
+    def _set_training_sample(self,
+                             line_id: List[int],
+                             sample_training: Dict[str, Any],
+                             sample_additional: Dict[str, Any]) -> None:
+        """
+        Set a sample which was read from the Databases by another component.
+
+        :param line_id: Index of the sample.
+        :param sample_training: Training data of the sample.
+        :param sample_additional: Additional data of the sample.
+        """
+
+        self.update_line = line_id
+        self.sample_training = sample_training
+        self.sample_additional = None if len(sample_additional) == 1 else sample_additional
+        self.__read_line = line_id
+
+    def _get_last_training_data(self) -> Dict[str, Any]:
+        """
+        Get the last training data set in the Environment.
+
+        :return: Training data of the current sample.
+        """
+
+        return self.__last_training_data
+
+    def get_substep_statistics(self) -> Dict[str, float]:
+        """
+        Get the timings of the fused sub-steps engine.
+
+        :return: Number of steps and sub-steps, mean step time, mean animate time and mean Python overhead per sub-step
+                 (in seconds).
+        """
+
+        stats = self.__substep_stats
+        nb_steps, nb_substeps = max(stats['nb_steps'], 1), max(stats['nb_substeps'], 1)
+        return {'nb_steps': stats['nb_steps'],
+                'nb_substeps': stats['nb_substeps'],
+                'step_time': stats['step_time'] / nb_steps,
+                'animate_time': stats['animate_time'] / nb_substeps,
+                'substep_overhead': (stats['step_time'] - stats['animate_time']) / nb_substeps}
+
     def update_visualisation(self) -> None:
         """
         Triggers the Visualizer update.
@@ -167,8 +524,106 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
         """
 
         description = BaseEnvironment.__str__(self)
+        stats = self.get_substep_statistics()
+        description += f"    Simulations per step: {self.simulations_per_step}\n"
+        if stats['nb_steps'] > 0:
+            description += f"    Mean step time: {stats['step_time'] * 1e3:.3f} ms\n"
+            description += f"    Mean sub-step Python overhead: {stats['substep_overhead'] * 1e6:.1f} us\n"
         return description
 
+    def _get_bound_data(self) -> Dict[str, ndarray]:
+        """
+        Compute the bound training fields into their reused buffers. Fields explicitly set with set_training_data are
+        skipped.
+
+        :return: Bound training fields.
+        """
+
+        data = {}
+        for field, binding in self.__bindings.items():
+            if field in self.__pending_training_data:
+                continue
+            # Resolve the MechanicalObject once the scene graph is created
+            if type(binding['mechanical_object']) == str:
+                binding['mechanical_object'] = self._get_object(binding['mechanical_object'])
+            mo = binding['mechanical_object']
+            if binding['quantity'] == 'displacement':
+                sources = [mo.position.array(), mo.rest_position.array()]
+            else:
+                sources = [mo.getData(binding['quantity']).array()]
+            # Allocate the buffers on first call, the field is computed in the precision of the Environment
+            if binding['buffers'] is None or binding['buffers']['value'].dtype != self.dtype:
+                nb_nodes = len(sources[0]) if binding['indices'] is None else len(binding['indices'])
+                shape = (nb_nodes,) + sources[0].shape[1:]
+                binding['buffers'] = {'gather': [empty(shape, dtype=sources[0].dtype) for _ in sources],
+                                      'value': empty(shape, dtype=self.dtype)}
+                if binding['scatter'] is not None:
+                    binding['buffers']['field'] = zeros((binding['size'],) + shape[1:], dtype=self.dtype)
+            buffers = binding['buffers']
+            # Gather the nodes of the MechanicalObject
+            if binding['indices'] is not None:
+                sources = [take(source, binding['indices'], axis=0, out=buffer)
+                           for source, buffer in zip(sources, buffers['gather'])]
+            # Compute the quantity
+            if binding['quantity'] == 'displacement':
+                value = subtract(sources[0], sources[1], out=buffers['value'])
+            else:
+                copyto(buffers['value'], sources[0])
+                value = buffers['value']
+            # Scatter the nodes in the field
+            if binding['scatter'] is not None:
+                buffers['field'][binding['scatter']] = value
+                value = buffers['field']
+            data[field] = value
+        return data
+
+    def _get_object(self,
+                    path: str) -> Sofa.Core.Object:
+        """
+        Get an object of the scene graph from its path.
+
+        :param path: Path to the object from the root node (e.g. '@fem.GridMO').
+        :return: Sofa object.
+        """
+
+        *nodes, name = path.lstrip('@').split('.')
+        node = self.root
+        for child in nodes:
+            node = None if node is None else node.getChild(child)
+        obj = None if node is None else node.getObject(name)
+        if obj is None:
+            raise ValueError(f"[{self.__class__.__name__}] Could not find object '{path}' in the scene graph.")
+        return obj
+
+    def _configure(self,
+                   simulations_per_step: int = 1,
+                   pipelined: bool = False,
+                   precision: str = 'float64') -> None:
+        """
+        Apply the options defined in the SofaEnvironmentConfig.
+
+        :param simulations_per_step: Number of fused sub-steps per step.
+        :param pipelined: If True, the animation of the next step starts in a dedicated thread once the current sample
+                          is sent.
+        :param precision: Precision of the floating point training data, either 'float64' or 'float32'.
+        """
+
+        if pipelined and self.factory is not None:
+            raise ValueError(f"[{self.__class__.__name__}] The visualization is not available with the pipelined step.")
+        self.simulations_per_step = simulations_per_step
+        self.dtype = dtype(precision)
+        self.pipelined = pipelined
+
+    def _set_listening(self,
+                       listening: bool) -> None:
+        """
+        Enable or disable the forwarding of the SOFA events to the Environment.
+
+        :param listening: If False, the Environment hooks are not triggered by SOFA events.
+        """
+
+        self.listening.value = listening
+
     def _create_visualization(self,
                               visualization_db: Union[Database, Tuple[str, str]],
                               produce_data: bool = True) -> None:
@@ -176,6 +631,9 @@ class SofaEnvironment(Sofa.Core.Controller, BaseEnvironment):
         Create a Factory for the Environment.
         """
 
+        if self.pipelined:
+            raise ValueError(f"[{self.__class__.__name__}] The visualization is not available with the pipelined step.")
+
         if type(visualization_db) == list:
             self.factory = UserAPI(root=self.root,
                                    database_dir=visualization_db[0],
@@ -1,14 +1,21 @@
-from typing import Type, Optional, Any, Dict
-from os.path import join, dirname
-from sys import modules, executable
+from typing import Type, Optional, Any, Dict, Tuple, List
+from os.path import join, dirname, basename
+from sys import modules, executable, path
 from subprocess import run
+from time import time
+from json import dumps
+from multiprocessing import get_context, get_all_start_methods
+from multiprocessing.context import BaseContext
 
-from DeepPhysX.Core.Environment.BaseEnvironmentConfig import BaseEnvironmentConfig
+from DeepPhysX.Core.Environment.BaseEnvironmentConfig import BaseEnvironmentConfig, TcpIpServer
 from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
 
 
 class SofaEnvironmentConfig(BaseEnvironmentConfig):
 
+    # Modules imported by the forkserver process, which is started once per Python process
+    __forkserver_preload: Optional[List[str]] = None
+
     def __init__(self,
                  environment_class: Type[SofaEnvironment],
                  as_tcp_ip_client: bool = True,
@@ -22,7 +29,11 @@ class SofaEnvironmentConfig(BaseEnvironmentConfig):
                  always_produce: bool = False,
                  visualizer: Optional[str] = None,
                  record_wrong_samples: bool = False,
-                 env_kwargs: Optional[Dict[Any, Any]] = None):
+                 env_kwargs: Optional[Dict[Any, Any]] = None,
+                 client_start_method: str = 'subprocess',
+                 pipelined_step: bool = False,
+                 nb_scenes: int = 1,
+                 precision: str = 'float64'):
         """
         SofaEnvironmentConfig is a configuration class to parameterize and create a SofaEnvironment for the
         EnvironmentManager.
@@ -32,7 +43,8 @@ class SofaEnvironmentConfig(BaseEnvironmentConfig):
         :param number_of_thread: Number of thread to run.
         :param ip_address: IP address of the TcpIpObject.
         :param port: Port number of the TcpIpObject.
-        :param simulations_per_step: Number of iterations to compute in the Environment at each time step.
+        :param simulations_per_step: Number of iterations to compute in the Environment at each time step. These
+                                     iterations are fused within a single SofaEnvironment step.
         :param max_wrong_samples_per_step: Maximum number of wrong samples to produce in a step.
         :param load_samples: If True, the dataset will always be used in the environment.
         :param only_first_epoch: If True, data will always be created from environment. If False, data will be created
@@ -41,6 +53,17 @@ class SofaEnvironmentConfig(BaseEnvironmentConfig):
         :param visualizer: Backend of the Visualizer to use.
         :param record_wrong_samples: If True, wrong samples are recorded through Visualizer.
         :param env_kwargs: Additional arguments to pass to the Environment.
+        :param client_start_method: Method to start the TcpIpClients, either 'subprocess' (a new Python interpreter per
+                                    client) or 'forkserver' (clients are forked from a warm server process which
+                                    imported Sofa, numpy and the Environment module once).
+        :param pipelined_step: If True, the animation of the next step runs in a dedicated thread once the current
+                               sample is sent. The user hooks can then not request predictions, and neither the
+                               visualizer nor the loading of the dataset samples are available.
+        :param nb_scenes: Number of scenes simulated by an Environment created in the current process. If greater than
+                          1, the scenes are gathered in a VectorizedSofaEnvironment, which requires 'as_tcp_ip_client'
+                          to be False.
+        :param precision: Precision of the floating point training data produced by the Environments, either 'float64'
+                          or 'float32'. Predictions are only converted back when they are written in the scene.
         """
 
         BaseEnvironmentConfig.__init__(self,
@@ -60,17 +83,137 @@ class SofaEnvironmentConfig(BaseEnvironmentConfig):
 
         self.environment_class: Type[SofaEnvironment] = environment_class
 
+        # Clients start method
+        if client_start_method not in ['subprocess', 'forkserver']:
+            raise ValueError(f"[{self.name}] The client start method must be either 'subprocess' or 'forkserver', got "
+                             f"'{client_start_method}'.")
+        if client_start_method == 'forkserver' and 'forkserver' not in get_all_start_methods():
+            raise ValueError(f"[{self.name}] The 'forkserver' start method is not available on this platform.")
+        self.client_start_method: str = client_start_method
+        if pipelined_step and (visualizer is not None or load_samples):
+            raise ValueError(f"[{self.name}] The pipelined step is not available with a visualizer or when the dataset "
+                             f"samples are loaded in the Environment.")
+        self.pipelined_step: bool = pipelined_step
+        # Time between the launch of the clients and the connection of the last one
+        self.spin_up_latency: Optional[float] = None
+        self.__clients_launch_time: float = 0.
+
+        # Vectorized scenes
+        if type(nb_scenes) != int or nb_scenes < 1:
+            raise ValueError(f"[{self.name}] The number of scenes must be a positive integer, got {nb_scenes}.")
+        if nb_scenes > 1 and as_tcp_ip_client:
+            raise ValueError(f"[{self.name}] Several scenes can only be simulated by an Environment created in the "
+                             f"current process, 'as_tcp_ip_client' must be False.")
+        self.nb_scenes: int = nb_scenes
+
+        # Precision of the training data
+        if precision not in ['float64', 'float32']:
+            raise ValueError(f"[{self.name}] The precision must be either 'float64' or 'float32', got '{precision}'.")
+        self.precision: str = precision
+
+    def create_server(self,
+                      environment_manager: Optional[Any] = None,
+                      batch_size: int = 1,
+                      visualization_db: Optional[Tuple[str, str]] = None) -> TcpIpServer:
+        """
+        Create a TcpIpServer and launch TcpIpClients in subprocesses.
+
+        :param environment_manager: EnvironmentManager.
+        :param batch_size: Number of sample in a batch.
+        :param visualization_db: Path to the visualization Database to connect to.
+        :return: TcpIpServer object.
+        """
+
+        # The sub-steps are fused in SofaEnvironment.step, the server only requests a single step per sample
+        if environment_manager is not None:
+            environment_manager.simulations_per_step = 1
+        self.__clients_launch_time = time()
+        return BaseEnvironmentConfig.create_server(self,
+                                                   environment_manager=environment_manager,
+                                                   batch_size=batch_size,
+                                                   visualization_db=visualization_db)
+
+    def start_server(self,
+                     server: TcpIpServer,
+                     visualization_db: Optional[Tuple[str, str]] = None) -> None:
+        """
+        Start TcpIpServer. The spin-up latency of the clients is measured once they are all connected.
+
+        :param server: TcpIpServer.
+        :param visualization_db: Path to the visualization Database to connect to.
+        """
+
+        server.connect()
+        self.spin_up_latency = time() - self.__clients_launch_time
+        server.initialize(visualization_db=visualization_db,
+                          env_kwargs=self.env_kwargs)
+        self.server_is_ready = True
+
     def start_client(self,
                      idx: int = 1) -> None:
         """
-        Run a subprocess to start a TcpIpClient.
+        Start a TcpIpClient in a new process.
 
         :param idx: Index of client.
         """
 
-        script = join(dirname(modules[SofaEnvironment.__module__].__file__), 'launcherSofaEnvironment.py')
-        run([executable, script, self.environment_file, self.environment_class.__name__,
-             self.ip_address, str(self.port), str(idx), str(self.number_of_thread)])
+        # Start a new Python interpreter
+        if self.client_start_method == 'subprocess':
+            script = join(dirname(modules[SofaEnvironment.__module__].__file__), 'launcherSofaEnvironment.py')
+            run([executable, script, self.environment_file, self.environment_class.__name__,
+                 self.ip_address, str(self.port), str(idx), str(self.number_of_thread),
+                 dumps(self.get_environment_options()), str(time())])
+
+        # Fork the client from the warm forkserver process
+        else:
+            from DeepPhysX.Sofa.Environment.launcherSofaEnvironment import launch_client
+            process = self.get_forkserver_context().Process(target=launch_client,
+                                                            kwargs={'file_path': self.environment_file,
+                                                                    'environment_class': self.environment_class.__name__,
+                                                                    'ip_address': self.ip_address,
+                                                                    'port': self.port,
+                                                                    'instance_id': idx,
+                                                                    'instance_nb': self.number_of_thread,
+                                                                    'options': self.get_environment_options(),
+                                                                    'start_time': time()})
+            process.start()
+            process.join()
+
+    def get_forkserver_context(self) -> BaseContext:
+        """
+        Get the forkserver multiprocessing context. The forkserver process is started once per Python process and is
+        then reused by every session: the modules are only imported when it starts, so every session must use the
+        same Environment module.
+
+        :return: Forkserver multiprocessing context.
+        """
+
+        context = get_context('forkserver')
+        # The Environment module must be importable from the forkserver process
+        if dirname(self.environment_file) not in path:
+            path.append(dirname(self.environment_file))
+        preload = ['numpy', 'Sofa', 'Sofa.Simulation', 'SofaRuntime',
+                   'DeepPhysX.Sofa.Environment.launcherSofaEnvironment', basename(self.environment_file)[:-3]]
+        # The preload list is only used when the forkserver process starts
+        if SofaEnvironmentConfig.__forkserver_preload is None:
+            context.set_forkserver_preload(preload)
+            SofaEnvironmentConfig.__forkserver_preload = preload
+        elif SofaEnvironmentConfig.__forkserver_preload != preload:
+            raise ValueError(f"[{self.name}] The forkserver process was already started with the modules "
+                             f"{SofaEnvironmentConfig.__forkserver_preload}, it can not preload {preload}. Use the "
+                             f"'subprocess' client start method for this Environment.")
+        return context
+
+    def get_environment_options(self) -> Dict[str, Any]:
+        """
+        Get the options to apply to the SofaEnvironment instances.
+
+        :return: Options of the SofaEnvironment.
+        """
+
+        return {'simulations_per_step': self.simulations_per_step,
+                'pipelined': self.pipelined_step,
+                'precision': self.precision}
 
     def create_environment(self) -> SofaEnvironment:
         """
@@ -80,9 +223,17 @@ class SofaEnvironmentConfig(BaseEnvironmentConfig):
         """
 
         # Create instance
-        environment = self.environment_class(as_tcp_ip_client=False,
-                                             **self.env_kwargs)
+        if self.nb_scenes > 1:
+            from DeepPhysX.Sofa.Environment.VectorizedSofaEnvironment import VectorizedSofaEnvironment
+            environment = VectorizedSofaEnvironment(environment_class=self.environment_class,
+                                                    nb_scenes=self.nb_scenes,
+                                                    scene_kwargs=self.env_kwargs,
+                                                    as_tcp_ip_client=False)
+        else:
+            environment = self.environment_class(as_tcp_ip_client=False,
+                                                 **self.env_kwargs)
         if not isinstance(environment, SofaEnvironment):
             raise TypeError(f"[{self.name}] The given 'environment_class'={self.environment_class} must be a "
                             f"SofaEnvironment.")
+        environment._configure(**self.get_environment_options())
         return environment
@@ -0,0 +1,258 @@
+from typing import Dict, Any, Type, Optional, List
+from functools import partial
+from numpy import ndarray, empty, stack, asarray, issubdtype, floating
+
+from DeepPhysX.Core.Environment.BaseEnvironment import BaseEnvironment
+from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
+
+
+class VectorizedSofaEnvironment(SofaEnvironment):
+
+    def __init__(self,
+                 environment_class: Type[SofaEnvironment],
+                 nb_scenes: int = 1,
+                 scene_kwargs: Optional[Dict[str, Any]] = None,
+                 as_tcp_ip_client: bool = False,
+                 instance_id: int = 1,
+                 instance_nb: int = 1,
+                 *args, **kwargs):
+        """
+        VectorizedSofaEnvironment runs several independent copies of a SofaEnvironment scene under a single root node.
+        The scenes are animated together and their training data are stacked with shape (nb_scenes, ...) in a single
+        Database sample. The Environment can only be owned by an EnvironmentManager.
+
+        :param environment_class: SofaEnvironment class describing a single scene.
+        :param nb_scenes: Number of scenes to simulate simultaneously.
+        :param scene_kwargs: Additional arguments to pass to each scene.
+        :param as_tcp_ip_client: Must be False, the Environment is owned by an EnvironmentManager.
+        :param instance_id: ID of the instance.
+        :param instance_nb: Number of simultaneously launched instances.
+        """
+
+        SofaEnvironment.__init__(self,
+                                 as_tcp_ip_client=as_tcp_ip_client,
+                                 instance_id=instance_id,
+                                 instance_nb=instance_nb,
+                                 *args, **kwargs)
+
+        # Check the scenes parameters
+        if as_tcp_ip_client:
+            raise ValueError(f"[{self.__class__.__name__}] The scenes can not be simulated by a TcpIpClient.")
+        if not issubclass(environment_class, SofaEnvironment):
+            raise TypeError(f"[{self.__class__.__name__}] The given 'environment_class'={environment_class} must be a "
+                            f"SofaEnvironment.")
+        if type(nb_scenes) != int or nb_scenes < 1:
+            raise ValueError(f"[{self.__class__.__name__}] The number of scenes must be a positive integer, got "
+                             f"{nb_scenes}.")
+        self.nb_scenes: int = nb_scenes
+        scene_kwargs = {} if scene_kwargs is None else scene_kwargs
+
+        # Per-scene data and stacked data buffers
+        self.__training_data: List[Dict[str, ndarray]] = [{} for _ in range(self.nb_scenes)]
+        self.__additional_data: List[Dict[str, ndarray]] = [{} for _ in range(self.nb_scenes)]
+        self.__buffers: Dict[str, Dict[str, ndarray]] = {'training': {}, 'additional': {}}
+
+        # Create the scenes, each one owns a child node of the shared root node
+        self.environments: List[SofaEnvironment] = []
+        for scene_id in range(self.nb_scenes):
+            environment = environment_class(as_tcp_ip_client=False,
+                                            instance_id=instance_id,
+                                            instance_nb=instance_nb,
+                                            **scene_kwargs)
+            environment.root.removeObject(environment)
+            environment.root = self.root.addChild(f'scene_{scene_id}')
+            environment.root.addObject(environment)
+            # Data of the scenes are gathered by the vectorized Environment
+            environment.define_training_fields = self.define_training_fields
+            environment.define_additional_fields = self.define_additional_fields
+            environment.set_training_data = partial(self.__set_scene_data, self.__training_data, scene_id)
+            environment.set_additional_data = partial(self.__set_scene_data, self.__additional_data, scene_id)
+            self.environments.append(environment)
+
+    ##########################################################################################
+    ##########################################################################################
+    #                                 Environment initialization                             #
+    ##########################################################################################
+    ##########################################################################################
+
+    def create(self) -> None:
+        """
+        Create the scene graph of each scene in its own child node.
+        """
+
+        for environment in self.environments:
+            environment.create()
+
+    def init(self) -> None:
+        """
+        Initialize the shared root node, then save the initial mechanical state of each scene.
+        """
+
+        SofaEnvironment.init(self)
+        for environment in self.environments:
+            environment.save_checkpoint()
+
+    def init_database(self) -> None:
+        """
+        Define the fields of the training dataset from the first scene.
+        """
+
+        self.environments[0].init_database()
+
+    ##########################################################################################
+    ##########################################################################################
+    #                                 Environment behavior                                   #
+    ##########################################################################################
+    ##########################################################################################
+
+    async def step(self):
+        """
+        Animate all the scenes with a single call.
+        """
+
+        for environment in self.environments:
+            environment.compute_training_data = self.compute_training_data
+        await SofaEnvironment.step(self)
+
+    async def on_step(self):
+        """
+        Executed after an animation step of the scenes. Stack the data of the scenes.
+        """
+
+        for environment in self.environments:
+            await environment.on_step()
+        if self.compute_training_data:
+            self._gather_data()
+
+    def check_sample(self) -> bool:
+        """
+        Check if the samples produced by every scene are usable for training.
+
+        :return: Current data can be used or not
+        """
+
+        return all([environment.check_sample() for environment in self.environments])
+
+    def apply_prediction(self,
+                         prediction: Dict[str, ndarray]) -> None:
+        """
+        Scatter the stacked network prediction to each scene.
+
+        :param prediction: Prediction data, with shape (nb_scenes, ...).
+        """
+
+        prediction = {field: asarray(value) for field, value in prediction.items()}
+        for field, value in prediction.items():
+            if len(value) != self.nb_scenes:
+                raise ValueError(f"[{self.__class__.__name__}] The prediction '{field}' must be stacked along the first "
+                                 f"dimension for the {self.nb_scenes} scenes, got shape {value.shape}.")
+        for scene_id, environment in enumerate(self.environments):
+            environment.apply_prediction({field: value[scene_id] for field, value in prediction.items()})
+
+    def save_checkpoint(self) -> None:
+        """
+        Save the current mechanical state of the checkpoint MechanicalObjects of each scene.
+        """
+
+        for environment in self.environments:
+            environment.save_checkpoint()
+
+    def restore_checkpoint(self) -> None:
+        """
+        Restore the mechanical state saved in the last checkpoint of each scene, scenes without checkpoint are reset.
+        """
+
+        self._stop_pipeline()
+        for environment in self.environments:
+            environment.restore_checkpoint()
+
+    def close(self) -> None:
+        """
+        Close each scene.
+        """
+
+        SofaEnvironment.close(self)
+        for environment in self.environments:
+            environment.close()
+
+    ##########################################################################################
+    ##########################################################################################
+    #                                   Available requests                                   #
+    ##########################################################################################
+    ##########################################################################################
+
+    def __set_scene_data(self,
+                         data: List[Dict[str, ndarray]],
+                         scene_id: int,
+                         **kwargs) -> None:
+        """
+        Store the data produced by a scene until the next stacking.
+
+        :param data: Per-scene data container.
+        :param scene_id: Index of the scene.
+        """
+
+        data[scene_id] = kwargs
+
+    def _gather_data(self) -> None:
+        """
+        Gather the data produced by each scene, bound training fields included, and stack them as the training data.
+        """
+
+        for scene_id, environment in enumerate(self.environments):
+            self.__training_data[scene_id] = {**environment._get_bound_data(), **self.__training_data[scene_id]}
+        self.__stack_data()
+
+    def __stack_data(self) -> None:
+        """
+        Stack the data produced by each scene into reused buffers and set them as the training data.
+        """
+
+        for table, data, setter in zip(['training', 'additional'],
+                                       [self.__training_data, self.__additional_data],
+                                       [SofaEnvironment.set_training_data, BaseEnvironment.set_additional_data]):
+            if len(data[0]) == 0:
+                continue
+            buffers = self.__buffers[table]
+            stacked = {}
+            for field in data[0].keys():
+                values = [asarray(scene_data[field]) for scene_data in data]
+                shape = (self.nb_scenes,) + values[0].shape
+                # Floating point data are directly stacked in the precision of the Environment
+                dtype = self.dtype if issubdtype(values[0].dtype, floating) else values[0].dtype
+                # Buffers are only re-allocated if the produced data changed
+                if field not in buffers or buffers[field].shape != shape or buffers[field].dtype != dtype:
+                    buffers[field] = empty(shape, dtype=dtype)
+                stacked[field] = stack(values, out=buffers[field])
+            setter(self, **stacked)
+
+    def _configure(self, **kwargs) -> None:
+        """
+        Apply the options defined in the SofaEnvironmentConfig, the precision is shared with the scenes.
+        """
+
+        SofaEnvironment._configure(self, **kwargs)
+        for environment in self.environments:
+            environment.dtype = self.dtype
+
+    def _set_listening(self,
+                       listening: bool) -> None:
+        """
+        Enable or disable the forwarding of the SOFA events to the Environment and to the scenes.
+
+        :param listening: If False, the Environment hooks are not triggered by SOFA events.
+        """
+
+        SofaEnvironment._set_listening(self, listening)
+        for environment in self.environments:
+            environment.listening.value = listening
+
+    def __str__(self):
+        """
+        :return: String containing information about the VectorizedSofaEnvironment object
+        """
+
+        description = SofaEnvironment.__str__(self)
+        description += f"    Number of scenes: {self.nb_scenes}\n"
+        description += f"    Scene class: {self.environments[0].__class__.__name__}\n"
+        return description
@@ -1,10 +1,6 @@
-from os.path import dirname
-from os import listdir
+from DeepPhysX.Sofa.Utils.lazy_import import lazy_package as _lazy_package
 
-package = dirname(__file__)
-exceptions = ['__init__.py', '__pycache__', 'launcherSofaEnvironment.py']
-modules = [module for module in listdir(package) if module.endswith('.py') and module not in exceptions]
-__all__ = []
-for module in sorted(modules):
-    exec(f"from DeepPhysX.Sofa.Environment.{module[:-3]} import {module[:-3]}")
-    __all__.append(module[:-3])
+# Exported symbols with their module, they are only imported on first access
+__all__, __getattr__, __dir__ = _lazy_package(__name__, {'SofaEnvironment': 'SofaEnvironment',
+                                                         'SofaEnvironmentConfig': 'SofaEnvironmentConfig',
+                                                         'VectorizedSofaEnvironment': 'VectorizedSofaEnvironment'})
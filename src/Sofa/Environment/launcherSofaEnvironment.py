@@ -1,31 +1,93 @@
+from typing import Optional, Dict, Any, Type, Callable
 from os import sep
 from os.path import dirname
 from sys import argv, path
+from time import time
+from importlib import import_module
+from json import loads
 
-from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment as Environment
 from DeepPhysX.Core.AsyncSocket.TcpIpClient import TcpIpClient
+from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
+
+
+def configured_environment(environment_class: Type[SofaEnvironment],
+                           options: Optional[Dict[str, Any]] = None) -> Callable[..., SofaEnvironment]:
+    """
+    Get a constructor of the Environment which applies the options to the new instance. The TcpIpClient creates and
+    initializes the Environment at once, the options are thus applied before the scene is created.
+
+    :param environment_class: SofaEnvironment class.
+    :param options: Options to apply to the SofaEnvironment.
+    :return: Constructor of the configured Environment.
+    """
+
+    def create_environment(*args, **kwargs) -> SofaEnvironment:
+        environment = environment_class(*args, **kwargs)
+        environment._configure(**({} if options is None else options))
+        return environment
+
+    return create_environment
+
+
+def launch_client(file_path: str,
+                  environment_class: str,
+                  ip_address: str,
+                  port: int,
+                  instance_id: int,
+                  instance_nb: int,
+                  options: Optional[Dict[str, Any]] = None,
+                  start_time: Optional[float] = None) -> Optional[float]:
+    """
+    Create, init and run a TcpIpClient with a SofaEnvironment.
+
+    :param file_path: Path to the file containing the Environment class.
+    :param environment_class: Name of the Environment class.
+    :param ip_address: IP address of the TcpIpServer.
+    :param port: Port number of the TcpIpServer.
+    :param instance_id: ID of the instance.
+    :param instance_nb: Number of simultaneously launched instances.
+    :param options: Options to apply to the SofaEnvironment.
+    :param start_time: Time at which the client was requested, used to report the spin-up latency.
+    :return: Spin-up latency of the client in seconds if the start time is defined.
+    """
+
+    # Import environment_class
+    path.append(dirname(file_path))
+    module_name = file_path.split(sep)[-1][:-3]
+    environment = getattr(import_module(module_name), environment_class)
+
+    # Create Tcp-Ip environment
+    client = TcpIpClient(environment=configured_environment(environment, options),
+                         ip_address=ip_address,
+                         port=port,
+                         instance_id=instance_id,
+                         instance_nb=instance_nb)
+    latency = None if start_time is None else time() - start_time
+    if latency is not None:
+        print(f"[launcherSofaEnvironment] Client {instance_id} spin-up latency: {latency:.3f}s")
+
+    # Init and run Tcp-Ip environment
+    client.initialize()
+    client.launch()
+    return latency
+
 
 if __name__ == '__main__':
 
     # Check script call
-    if len(argv) != 7:
+    if len(argv) != 9:
         print(f"Usage: python3 {argv[0]} <file_path> <environment_class> <ip_address> <port> <instance_id> "
-              f"<max_instance_count> <visu_db>")
+              f"<max_instance_count> <environment_options> <start_time>")
         exit(1)
 
-    # Import environment_class
-    path.append(dirname(argv[1]))
-    module_name = argv[1].split(sep)[-1][:-3]
-    exec(f"from {module_name} import {argv[2]} as Environment")
-
-    # Create, init and run Tcp-Ip environment
-    client = TcpIpClient(environment=Environment,
-                         ip_address=argv[3],
-                         port=int(argv[4]),
-                         instance_id=int(argv[5]),
-                         instance_nb=int(argv[6]))
-    client.initialize()
-    client.launch()
+    launch_client(file_path=argv[1],
+                  environment_class=argv[2],
+                  ip_address=argv[3],
+                  port=int(argv[4]),
+                  instance_id=int(argv[5]),
+                  instance_nb=int(argv[6]),
+                  options=loads(argv[7]),
+                  start_time=float(argv[8]))
 
     # Client is closed at this point
     print(f"[launcherSofaEnvironment] Shutting down client {argv[3]}")
@@ -1,10 +1,25 @@
-from typing import Optional
+from typing import Optional, Dict, List, Any
+from os.path import join, isdir, dirname
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Thread, Event, Lock
+from queue import Queue, Full
+from collections import deque
+from json import dump
+from numpy import ndarray, array, sqrt, mean
 import Sofa
+import Sofa.Simulation
 
 from DeepPhysX.Core.Pipelines.BasePrediction import BasePrediction
 from DeepPhysX.Core.Network.BaseNetworkConfig import BaseNetworkConfig
 from DeepPhysX.Core.Database.BaseDatabaseConfig import BaseDatabaseConfig
+from DeepPhysX.Core.Database.DatabaseHandler import DatabaseHandler
 from DeepPhysX.Sofa.Environment.SofaEnvironmentConfig import SofaEnvironmentConfig
+from DeepPhysX.Sofa.Utils.prediction_cache import PredictionCache
+from DeepPhysX.Sofa.Utils.interpolation import PredictionInterpolator
+from DeepPhysX.Sofa.Utils.timing import PhaseTimer
+from DeepPhysX.Sofa.Utils.recorder import ChunkedRecorder
+from DeepPhysX.Sofa.Utils.batch import predict_batch
 
 
 class SofaPrediction(Sofa.Core.Controller, BasePrediction):
@@ -17,10 +32,26 @@ class SofaPrediction(Sofa.Core.Controller, BasePrediction):
                  session_name: str = 'training',
                  step_nb: int = -1,
                  record: bool = False,
+                 asynchronous: bool = False,
+                 prefetch_depth: int = 0,
+                 cache_size: int = 0,
+                 cache_quantization: Optional[float] = None,
+                 cache_fields: Optional[List[str]] = None,
+                 prediction_stride: int = 1,
+                 interpolation: str = 'linear',
+                 stride_evaluation: bool = False,
+                 chunked_record: bool = False,
+                 record_chunk_size: int = 256,
                  *args, **kwargs):
         """
         SofaPrediction is a pipeline defining the running process of an artificial neural network.
         It provides a highly tunable learning process that can be used with any machine learning library.
+        The latency of each phase of a frame is measured. At the end of the session, the percentiles and the counters of
+        the session are available in 'statistics' and saved in the session repository.
+        If the Environment simulates several scenes (see SofaEnvironmentConfig 'nb_scenes'), the inputs of the scenes are
+        gathered in a batch of shape (nb_scenes, ...) so that the Network runs a single forward pass per frame.
+        In asynchronous mode, a copy of the input of a frame is submitted to a background inference worker and the most
+        recent completed prediction is applied at the next frame, so that the rendering does not wait for the Network.
 
         :param network_config: Configuration object with the parameters of the Network.
         :param environment_config: Configuration object with the parameters of the Environment.
@@ -28,7 +59,25 @@ class SofaPrediction(Sofa.Core.Controller, BasePrediction):
         :param session_dir: Relative path to the directory which contains sessions repositories.
         :param session_name: Name of the new the session repository.
         :param step_nb: Number of simulation step to play.
-        :param record: If True, prediction data will be saved in a dedicated Database.
+        :param record: If True, prediction samples are saved in the Database.
+        :param asynchronous: If True, predictions are computed in a background worker with a latency of one frame.
+        :param prefetch_depth: If the samples are loaded from the Database, number of upcoming samples read ahead of
+                               time by a background thread with its own Database connections. Samples are read in the
+                               SOFA thread if 0.
+        :param cache_size: Number of predictions kept in a LRU cache keyed by the Network inputs. Inputs already
+                           predicted are then not forwarded to the Network again, thus the cached frames are not
+                           recorded in the Database. No cache is used if 0.
+        :param cache_quantization: If set, inputs are rounded to this step before being hashed.
+        :param cache_fields: Names of the training fields used as cache key, default is ['input'].
+        :param prediction_stride: Number of frames between two Network evaluations. The predictions of the intermediate
+                                  frames are interpolated between two consecutive Network predictions, thus delayed by
+                                  'prediction_stride' frames.
+        :param interpolation: Interpolation method of the intermediate predictions, either 'linear' or 'spline'.
+        :param stride_evaluation: If True, the Network is still evaluated at each frame to measure the error of the
+                                  interpolated predictions, reported at the end of the session.
+        :param chunked_record: If True, the inputs and the predictions are streamed to the 'recording' directory of the
+                               session repository by a background writer, in chunks of 'record_chunk_size' frames.
+        :param record_chunk_size: Number of recorded frames per chunk.
         """
 
         Sofa.Core.Controller.__init__(self, *args, **kwargs)
@@ -42,38 +91,413 @@ class SofaPrediction(Sofa.Core.Controller, BasePrediction):
                                 record=record)
 
         self.prediction_begin()
-        self.root = self.data_manager.environment_manager.environment.root
-        self.root.addObject(self)
+        self.environment = self.data_manager.environment_manager.environment
+        self.root = self.environment.root
+        from DeepPhysX.Sofa.Environment.VectorizedSofaEnvironment import VectorizedSofaEnvironment
+        self.batched = isinstance(self.environment, VectorizedSofaEnvironment)
+        if self.batched:
+            # SOFA events are propagated top-down: a last child node receives them after every scene node
+            self.root.addChild('prediction').addObject(self)
+        else:
+            self.root.addObject(self)
         self.load_samples = environment_config.load_samples
+        # The samples are only saved in the Database by the DataManager, which is bypassed by these modes
+        if record and (self.batched or asynchronous):
+            raise ValueError(f"[{self.__class__.__name__}] The prediction samples can not be saved in the Database "
+                             f"with several scenes or in asynchronous mode, use 'chunked_record' instead.")
+        if record and cache_size > 0:
+            raise ValueError(f"[{self.__class__.__name__}] The prediction samples can not be saved in the Database "
+                             f"with a prediction cache, the cached frames would not be recorded.")
+
+        # Latency of the phases of a frame
+        self.timer = PhaseTimer()
+        self.timings_file = join(session_dir, session_name, 'prediction_timings.json')
+        self.__apply_time = 0.
+        self.__last_frame: Optional[float] = None
+        # Latencies and counters of the session, set when the session is closed
+        self.statistics: Dict[str, Any] = {}
+
+        # Streaming recorder of the inputs and predictions
+        self.recorder: Optional[ChunkedRecorder] = None
+        if chunked_record:
+            self.recorder = ChunkedRecorder(directory=join(session_dir, session_name, 'recording'),
+                                            chunk_size=record_chunk_size)
+
+        # Asynchronous inference worker, predictions are applied in the SOFA thread
+        self.asynchronous = asynchronous
+        self.nb_applied_predictions = 0
+        self.nb_stale_predictions = 0
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__next_prediction: Optional[Future] = None
+        self.__submitted_inputs: Optional[Dict[str, ndarray]] = None
+        self.__apply_prediction = self.environment.apply_prediction
+        if self.asynchronous:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+
+        # Memoization of the predictions
+        self.cache: Optional[PredictionCache] = None
+        self.__cache_key: Optional[bytes] = None
+        if cache_size > 0:
+            self.cache = PredictionCache(max_size=cache_size,
+                                         quantization=cache_quantization,
+                                         fields=['input'] if cache_fields is None else cache_fields)
+
+        # Temporal decimation of the Network evaluations
+        self.interpolator: Optional[PredictionInterpolator] = None
+        self.stride_evaluation = stride_evaluation
+        self.stride_errors: List[float] = []
+        self.__frame = 0
+        self.__exact_prediction: Optional[Dict[str, ndarray]] = None
+        self.__exact_predictions: deque = deque(maxlen=prediction_stride + 1)
+        if prediction_stride != 1:
+            if self.asynchronous:
+                raise ValueError(f"[{self.__class__.__name__}] The prediction stride cannot be used in asynchronous "
+                                 f"mode.")
+            self.interpolator = PredictionInterpolator(stride=prediction_stride,
+                                                       method=interpolation)
+
+        # The predictions computed by the Network are intercepted before being applied
+        self.environment.apply_prediction = self.__on_prediction
+
+        # Background prefetching of the Database samples
+        if type(prefetch_depth) != int or prefetch_depth < 0:
+            raise ValueError(f"[{self.__class__.__name__}] The prefetch depth must be a positive integer, got "
+                             f"{prefetch_depth}.")
+        self.__prefetched: Optional[Queue] = None
+        self.__prefetch_stop = Event()
+        self.__prefetch_thread: Optional[Thread] = None
+        # The DataManager is shared with the prefetch thread, which reads the samples with its own DatabaseHandler
+        self.__database_lock = Lock()
+        self.__sample_id: Optional[int] = None
+        if self.load_samples and prefetch_depth > 0:
+            self.__prefetched = Queue(maxsize=prefetch_depth)
+            self.__prefetch_thread = Thread(target=self.__prefetch_samples, daemon=True)
+            self.__prefetch_thread.start()
 
     def onAnimateBeginEvent(self, _):
 
         if self.load_samples:
-            sample_id = self.data_manager.load_sample()
-            self.data_manager.environment_manager.environment._get_training_data(sample_id)
+            if self.__prefetched is not None:
+                # Only pop a sample that was already read, the Environment does not read the Database again
+                with self.timer.measure('load_sample'):
+                    self.__sample_id, sample_training, sample_additional = self.__prefetched.get()
+                self.environment._set_training_sample(self.__sample_id, sample_training, sample_additional)
+            else:
+                with self.timer.measure('load_sample'), self.__database_lock:
+                    self.__sample_id = self.data_manager.load_sample()
+                with self.timer.measure('get_training_data'), self.__database_lock:
+                    self.environment._get_training_data(self.__sample_id)
 
     def onAnimateEndEvent(self, _):
         """
         Called within the Sofa pipeline at the end of the time step.
         """
 
-        if self.prediction_condition():
+        # Duration of the whole frame, rendering included
+        now = perf_counter()
+        if self.__last_frame is not None:
+            self.timer.add('frame', now - self.__last_frame)
+        self.__last_frame = now
+
+        if self.asynchronous:
+            self.__asynchronous_step()
+        elif self.prediction_condition():
             self.sample_begin()
-            self.predict()
+            if self.batched and not self.load_samples:
+                # Stack the inputs of the scenes, the prediction is then scattered by the Environment
+                with self.timer.measure('gather_data'):
+                    self.environment._gather_data()
+            if self.interpolator is not None:
+                self.__strided_step()
+            elif not self.__apply_cached_prediction():
+                self.predict()
             self.sample_end()
 
+    def run_headless(self,
+                     nb_steps: Optional[int] = None) -> Dict[str, float]:
+        """
+        Run the prediction session without SOFA GUI, the frames are animated as fast as possible. The session is closed
+        at the end.
+
+        :param nb_steps: Number of frames to animate, default is the number of simulation steps of the session.
+        :return: Number of frames, frames per second and percentiles of the frame latency in seconds.
+        """
+
+        nb_steps = self.step_nb if nb_steps is None else nb_steps
+        if nb_steps is None or nb_steps < 0:
+            raise ValueError(f"[{self.__class__.__name__}] The number of frames must be defined to run without GUI, got "
+                             f"{nb_steps}.")
+
+        # Animate the frames, no visual update is performed
+        start = perf_counter()
+        for _ in range(nb_steps):
+            with self.timer.measure('animate'):
+                Sofa.Simulation.animate(self.root, self.root.dt.value)
+        elapsed = perf_counter() - start
+
+        stats = self.timer.summary().get('animate', {})
+        stats = {'nb_frames': nb_steps,
+                 'frames_per_second': nb_steps / elapsed if elapsed > 0 else 0.,
+                 **{f'frame_{key}': value for key, value in stats.items() if key != 'count'}}
+        print(f"[{self.__class__.__name__}] {nb_steps} frames in {elapsed:.3f}s ({stats['frames_per_second']:.1f} "
+              f"frames/s)")
+        self.close()
+        return stats
+
     def predict(self) -> None:
         """
         Pull the data from the manager and return the prediction.
         """
 
-        self.data_manager.get_data(epoch=0,
-                                   animate=False,
-                                   load_samples=not self.load_samples)
+        # The Database exchange, the normalization and the Network forward are measured together, the prediction is
+        # applied in the same thread and its latency is measured apart
+        apply_time = self.__apply_time
+        start = perf_counter()
+        if self.batched:
+            self.__predict_batch()
+        else:
+            with self.__database_lock:
+                # The prefetch thread may have drawn other samples since the current one
+                if self.load_samples:
+                    self.data_manager.data_lines = [self.__sample_id]
+                self.data_manager.get_data(epoch=0,
+                                           animate=False,
+                                           load_samples=not self.load_samples)
+        self.timer.add('get_data', perf_counter() - start - (self.__apply_time - apply_time))
+
+    def __predict_batch(self) -> None:
+        """
+        Compute the predictions of the scenes with a single forward pass of the Network, the stacked inputs of the
+        scenes being the batch.
+        """
+
+        prediction = predict_batch(network_manager=self.network_manager,
+                                   batch=self.__get_inputs(),
+                                   normalization=self.data_manager.normalization,
+                                   timer=self.timer)
+        self.environment.apply_prediction(prediction)
+
+    def __prefetch_samples(self) -> None:
+        """
+        Read the upcoming samples of the Database until the prefetch queue is full. The Database partitions are opened
+        again in this thread so that the DatabaseHandler of the Environment is only used by the SOFA thread.
+        """
+
+        environment_handler = self.environment.get_database_handler()
+        database_handler = DatabaseHandler()
+        database_handler.init_remote(storing_partitions=[list(partition.get_path())
+                                                         for partition in environment_handler.get_partitions()],
+                                     exchange_db=list(environment_handler.get_exchange().get_path()))
+
+        while not self.__prefetch_stop.is_set():
+            with self.__database_lock:
+                sample_id = self.data_manager.load_sample()
+            sample = (sample_id,
+                      database_handler.get_line(table_name='Training', line_id=sample_id),
+                      database_handler.get_line(table_name='Additional', line_id=sample_id))
+            while not self.__prefetch_stop.is_set():
+                try:
+                    self.__prefetched.put(sample, timeout=0.1)
+                    break
+                except Full:
+                    pass
+
+        for database in database_handler.get_partitions() + [database_handler.get_exchange()]:
+            database.close()
+
+    def __strided_step(self) -> None:
+        """
+        Evaluate the Network every 'prediction_stride' frames and apply the interpolated predictions.
+        """
+
+        frame = self.__frame % self.interpolator.stride
+        self.__frame += 1
+        if frame == 0 or self.stride_evaluation:
+            if not self.__apply_cached_prediction():
+                self.predict()
+            if frame == 0:
+                self.interpolator.push(self.__exact_prediction)
+            if self.stride_evaluation:
+                self.__exact_predictions.append({field: array(value)
+                                                 for field, value in self.__exact_prediction.items()})
+        prediction = self.interpolator.get(frame)
+        if prediction is None:
+            return
+        self.__apply(prediction)
+
+        # The interpolated prediction is delayed by 'prediction_stride' frames
+        if self.stride_evaluation and len(self.__exact_predictions) == self.__exact_predictions.maxlen:
+            exact = self.__exact_predictions[0]
+            self.stride_errors.append(float(mean([sqrt(mean((prediction[field] - exact[field]) ** 2))
+                                                  for field in prediction.keys()])))
+
+    def __asynchronous_step(self) -> None:
+        """
+        Apply the most recent completed prediction and submit the input of the current frame to the worker.
+        """
+
+        # Apply the prediction completed since the last frame, the previous one stays displayed otherwise
+        if self.__next_prediction is not None and self.__next_prediction.done():
+            prediction = self.__next_prediction.result()
+            self.__next_prediction = None
+            if self.cache is not None and self.__cache_key is not None:
+                self.cache.put(self.__cache_key, prediction)
+                self.__cache_key = None
+            self.__apply(prediction, self.__submitted_inputs)
+            self.__submitted_inputs = None
+            self.nb_applied_predictions += 1
+            self.sample_end()
+        elif self.nb_applied_predictions > 0:
+            self.nb_stale_predictions += 1
+
+        # Only a single input is processed at a time, the worker is busy with an older frame otherwise
+        if self.__next_prediction is None and self.prediction_condition():
+            if self.batched and not self.load_samples:
+                with self.timer.measure('gather_data'):
+                    self.environment._gather_data()
+            self.sample_begin()
+            if self.__apply_cached_prediction():
+                self.nb_applied_predictions += 1
+                self.sample_end()
+            else:
+                # The worker only reads a copy of the inputs, which the next frames overwrite in the Environment
+                with self.timer.measure('copy_inputs'):
+                    self.__submitted_inputs = {field: array(value) for field, value in self.__get_inputs().items()
+                                               if isinstance(value, ndarray)}
+                self.__next_prediction = self.__executor.submit(self.__predict_sample, self.__submitted_inputs)
+
+    def __apply_cached_prediction(self) -> bool:
+        """
+        Apply the cached prediction of the current inputs if they were already predicted.
+
+        :return: True if a cached prediction was applied.
+        """
+
+        if self.cache is None:
+            return False
+        self.__cache_key = self.cache.key(self.__get_inputs())
+        prediction = self.cache.get(self.__cache_key)
+        if prediction is None:
+            return False
+        self.__use_prediction(prediction)
+        return True
+
+    def __predict_sample(self,
+                         inputs: Dict[str, ndarray]) -> Dict[str, ndarray]:
+        """
+        Compute a prediction in the background worker. Neither the Environment nor the Database are accessed.
+
+        :param inputs: Copy of the inputs of the frame.
+        :return: Prediction data.
+        """
+
+        start = perf_counter()
+        net_fields = self.network_manager.network.net_fields
+        if self.batched:
+            prediction = predict_batch(network_manager=self.network_manager,
+                                       batch={field: inputs[field] for field in net_fields},
+                                       normalization=self.data_manager.normalization,
+                                       timer=self.timer)
+        else:
+            # A single sample is predicted as a batch of one
+            prediction = predict_batch(network_manager=self.network_manager,
+                                       batch={field: inputs[field][None] for field in net_fields},
+                                       normalization=self.data_manager.normalization,
+                                       timer=self.timer)
+            prediction = {field: value[0] for field, value in prediction.items()}
+        self.timer.add('get_data', perf_counter() - start)
+        return prediction
+
+    def __get_inputs(self) -> Dict[str, ndarray]:
+        """
+        Get the inputs of the current frame, either loaded from the Database or produced by the Environment.
+
+        :return: Training data of the current frame.
+        """
+
+        return self.environment.sample_training if self.load_samples else self.environment._get_last_training_data()
+
+    def __on_prediction(self,
+                        prediction: Dict[str, ndarray]) -> None:
+        """
+        Cache the prediction computed by the Network, then apply it.
+
+        :param prediction: Prediction data.
+        """
+
+        if self.cache is not None:
+            prediction = {field: array(value) for field, value in prediction.items()}
+            if self.__cache_key is not None:
+                self.cache.put(self.__cache_key, prediction)
+                self.__cache_key = None
+        self.__use_prediction(prediction)
+
+    def __use_prediction(self,
+                         prediction: Dict[str, ndarray]) -> None:
+        """
+        Apply a prediction in the SOFA thread, or keep it to be interpolated if a prediction stride is used.
+
+        :param prediction: Prediction data.
+        """
+
+        if self.interpolator is not None:
+            self.__exact_prediction = prediction
+        else:
+            self.__apply(prediction)
+
+    def __apply(self,
+                prediction: Dict[str, ndarray],
+                inputs: Optional[Dict[str, ndarray]] = None) -> None:
+        """
+        Apply a prediction in the Environment.
+
+        :param prediction: Prediction data.
+        :param inputs: Inputs of the prediction, default is the inputs of the current frame.
+        """
+
+        start = perf_counter()
+        self.__apply_prediction(prediction)
+        latency = perf_counter() - start
+        if not self.asynchronous:
+            self.__apply_time += latency
+        self.timer.add('apply_prediction', latency)
+
+        # Record the inputs with the applied prediction
+        if self.recorder is not None:
+            inputs = self.__get_inputs() if inputs is None else inputs
+            self.recorder.append({**{field: value for field, value in inputs.items() if isinstance(value, ndarray)},
+                                  **prediction})
 
     def close(self) -> None:
         """
         Manually trigger the end of the Pipeline.
         """
 
+        if self.__prefetch_thread is not None:
+            self.__prefetch_stop.set()
+            self.__prefetch_thread.join()
+            self.__prefetch_thread = None
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        self.environment.apply_prediction = self.__apply_prediction
+        if self.recorder is not None:
+            self.recorder.close()
+
+        # Statistics of the session, saved with the latencies of the phases
+        self.statistics = {'phases': self.timer.summary()}
+        if self.asynchronous:
+            self.statistics['asynchronous'] = {'applied': self.nb_applied_predictions,
+                                               'stale': self.nb_stale_predictions}
+        if len(self.stride_errors) > 0:
+            self.statistics['stride_error'] = {'mean': float(mean(self.stride_errors)),
+                                               'max': float(max(self.stride_errors))}
+        if self.cache is not None:
+            self.statistics['cache'] = {'hits': self.cache.hits,
+                                        'misses': self.cache.misses}
+        if self.recorder is not None:
+            self.statistics['recorded_frames'] = self.recorder.nb_samples
+        if isdir(dirname(self.timings_file)):
+            with open(self.timings_file, 'w') as file:
+                dump(self.statistics, file, indent=4)
         self.prediction_end()
@@ -0,0 +1,64 @@
+from typing import Any, Dict, List, Optional
+from time import perf_counter
+from numpy import ndarray, asarray
+
+from DeepPhysX.Sofa.Utils.timing import PhaseTimer
+
+
+def predict_batch(network_manager: Any,
+                  batch: Dict[str, ndarray],
+                  normalization: Optional[Dict[str, List[float]]] = None,
+                  timer: Optional[PhaseTimer] = None) -> Dict[str, ndarray]:
+    """
+    Compute the predictions of a batch of samples with a single forward pass of the Network. Each sample is processed
+    as compute_online_prediction of the NetworkManager processes a single sample, the batch dimension being the first
+    dimension of the Network inputs instead of a batch of one.
+
+    :param network_manager: NetworkManager of the pipeline.
+    :param batch: Network input fields, with shape (batch_size, ...).
+    :param normalization: Normalization coefficients.
+    :param timer: If set, the latencies of the normalization and of the Network forward are measured.
+    :return: Predicted fields, with shape (batch_size, ...).
+    """
+
+    normalization = {} if normalization is None else normalization
+    network = network_manager.network
+    batch_size = None
+
+    # Apply normalization and convert to tensor
+    start = perf_counter()
+    sample = {}
+    for field in network.net_fields:
+        sample[field] = asarray(batch[field])
+        if batch_size is None:
+            batch_size = len(sample[field])
+        elif len(sample[field]) != batch_size:
+            raise ValueError(f"[predict_batch] The fields of the batch must have the same first dimension, got "
+                             f"{len(sample[field])} for '{field}' instead of {batch_size}.")
+        if field in normalization.keys():
+            sample[field] = network_manager.normalize_data(data=sample[field],
+                                                           normalization=normalization[field])
+        sample[field] = network.numpy_to_tensor(data=sample[field])
+
+    # Compute prediction
+    normalization_time = perf_counter() - start
+    start = perf_counter()
+    data_net = network_manager.data_transformation.transform_before_prediction(sample)
+    data_pred = network.predict(data_net)
+    data_pred, _ = network_manager.data_transformation.transform_before_loss(data_pred)
+    data_pred = network_manager.data_transformation.transform_before_apply(data_pred)
+    forward_time = perf_counter() - start
+
+    # Return the prediction
+    start = perf_counter()
+    for field in data_pred.keys():
+        data_pred[field] = network.tensor_to_numpy(data=data_pred[field])
+        if network.pred_norm_fields[field] in normalization.keys():
+            data_pred[field] = network_manager.normalize_data(data=data_pred[field],
+                                                              normalization=normalization[
+                                                                  network.pred_norm_fields[field]],
+                                                              reverse=True)
+    if timer is not None:
+        timer.add('normalization', normalization_time + perf_counter() - start)
+        timer.add('forward', forward_time)
+    return data_pred
@@ -0,0 +1,153 @@
+from typing import Dict, Any, Optional, Callable, Sequence
+from os import environ, listdir, makedirs, rename, replace, getpid
+from os.path import join, expanduser, isdir, exists
+from shutil import rmtree
+from hashlib import sha1
+import json
+from numpy import ndarray, generic, asarray, array, save, load
+
+
+def get_cache_dir(name: str = '') -> str:
+    """
+    Get the path to a cache directory. The root cache directory can be set with the DEEPPHYSX_SOFA_CACHE environment
+    variable.
+
+    :param name: Name of the cache sub-directory.
+    :return: Path to the cache directory.
+    """
+
+    root = environ.get('DEEPPHYSX_SOFA_CACHE', join(expanduser('~'), '.cache', 'DeepPhysX', 'Sofa'))
+    path = join(root, name)
+    makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the hash of the content of a file.
+
+    :param file_path: Path to the file.
+    :return: Hexadecimal digest of the file content.
+    """
+
+    digest = sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_parameters(**parameters: Any) -> str:
+    """
+    Compute a stable hash of a set of parameters.
+
+    :param parameters: Parameters to hash, arrays are hashed by value.
+    :return: Hexadecimal digest of the parameters.
+    """
+
+    digest = sha1()
+    for key in sorted(parameters.keys()):
+        value = parameters[key]
+        digest.update(key.encode())
+        if isinstance(value, ndarray):
+            digest.update(str((value.dtype, value.shape)).encode())
+            digest.update(value.tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def save_arrays(path: str,
+                arrays: Dict[str, Any]) -> None:
+    """
+    Save a set of arrays in a cache entry. The entry is written in a temporary directory which is then renamed, so that
+    concurrent processes never read a partially written entry.
+
+    :param path: Path to the cache entry.
+    :param arrays: Arrays to save.
+    """
+
+    if exists(path):
+        return
+    tmp_path = f'{path}.tmp{getpid()}'
+    makedirs(tmp_path, exist_ok=True)
+    for name, array in arrays.items():
+        save(join(tmp_path, f'{name}.npy'), asarray(array), allow_pickle=False)
+    try:
+        rename(tmp_path, path)
+    except OSError:
+        # Another process already wrote the same entry
+        rmtree(tmp_path, ignore_errors=True)
+
+
+def load_arrays(path: str,
+                mmap: bool = True) -> Optional[Dict[str, ndarray]]:
+    """
+    Load the arrays of a cache entry.
+
+    :param path: Path to the cache entry.
+    :param mmap: If True, arrays are memory-mapped in read-only mode.
+    :return: Loaded arrays or None if the entry does not exist.
+    """
+
+    if not isdir(path):
+        return None
+    return {file[:-4]: load(join(path, file), mmap_mode='r' if mmap else None, allow_pickle=False)
+            for file in listdir(path) if file.endswith('.npy')}
+
+
+def cached_values(name: str,
+                  compute: Callable[[], Dict[str, Any]],
+                  files: Sequence[str] = (),
+                  cache_dir: Optional[str] = None,
+                  **parameters: Any) -> Dict[str, Any]:
+    """
+    Get a set of values derived from files (e.g. geometric parameters of meshes) from a small file of the on-disk
+    cache. The values are only computed if no entry matches the content of the files and the parameters. Values are
+    always returned as decoded from the cache entry: NumPy scalars become Python scalars and tuples become lists.
+
+    :param name: Name of the set of values.
+    :param compute: Function computing the values, only called if the values are not cached yet.
+    :param files: Files the values are derived from, the cache key uses the hash of their content.
+    :param cache_dir: Path to the cache directory.
+    :param parameters: Additional parameters defining the cache key.
+    :return: Derived values.
+    """
+
+    cache_dir = get_cache_dir('values') if cache_dir is None else cache_dir
+    key = hash_parameters(name=name, files=[hash_file(file) for file in files], **parameters)
+    path = join(cache_dir, f'{key}.json')
+    if exists(path):
+        with open(path) as file:
+            return json.load(file, object_hook=_decode_value)
+    content = json.dumps(compute(), default=_encode_value)
+    makedirs(cache_dir, exist_ok=True)
+    # The entry is written in a temporary file which is then renamed, so that it is never read partially written
+    tmp_path = f'{path}.tmp{getpid()}'
+    with open(tmp_path, 'w') as file:
+        file.write(content)
+    replace(tmp_path, path)
+    # Computed values are returned with the types of the cached values
+    return json.loads(content, object_hook=_decode_value)
+
+
+def _encode_value(value: Any) -> Any:
+    """
+    Encode the NumPy values in JSON.
+    """
+
+    if isinstance(value, ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': str(value.dtype)}
+    if isinstance(value, generic):
+        return value.item()
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable.")
+
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    """
+    Decode the NumPy arrays from JSON.
+    """
+
+    if '__ndarray__' in value:
+        return array(value['__ndarray__'], dtype=value['dtype'])
+    return value
@@ -0,0 +1,167 @@
+from typing import Dict, Any, Optional, Sequence, Tuple
+from os.path import join
+from numpy import ndarray, asarray, rint, arange, full, zeros, fromiter, array_equal, int32, int64, cumsum, repeat, \
+    concatenate, unique, maximum
+
+from DeepPhysX.Sofa.Utils.cache import get_cache_dir, hash_parameters, save_arrays, load_arrays
+
+
+def regular_grid_indices(positions: ndarray,
+                         bbox_min: Sequence[float],
+                         bbox_max: Sequence[float],
+                         resolution: Sequence[int]) -> ndarray:
+    """
+    Compute the indices of nodes in a regular grid from their positions. Nodes are numbered along x first, then y,
+    then z, as in the RegularGridTopology of SOFA.
+
+    :param positions: Positions of the nodes, lying on the regular grid.
+    :param bbox_min: Min lower corner of the regular grid.
+    :param bbox_max: Max upper corner of the regular grid.
+    :param resolution: Number of nodes of the regular grid in each direction.
+    :return: Index of each node in the regular grid.
+    """
+
+    bbox_min, bbox_max = asarray(bbox_min, dtype=float), asarray(bbox_max, dtype=float)
+    resolution = asarray(resolution, dtype=int)
+    if (resolution < 1).any():
+        raise ValueError(f"[regular_grid_indices] The resolution must be positive in each direction, got {resolution}.")
+    # A direction with a single node has no cell, every node is then at index 0 along this direction
+    flat = resolution == 1
+    cell_size = (bbox_max - bbox_min) / maximum(resolution - 1, 1)
+    cell_size[flat] = 1.
+    ijk = rint((asarray(positions).reshape(-1, 3) - bbox_min) / cell_size).astype(int)
+    ijk[:, flat] = 0
+    return (ijk[:, 0] + resolution[0] * (ijk[:, 1] + resolution[1] * ijk[:, 2])).astype(int32)
+
+
+def grid_correspondence(indices_sparse_to_regular: ndarray,
+                        rest_positions: ndarray,
+                        nb_nodes_regular_grid: int) -> Dict[str, ndarray]:
+    """
+    Build both directions of the correspondence between a sparse grid and its regular grid.
+
+    :param indices_sparse_to_regular: Index in the regular grid of each node of the sparse grid.
+    :param rest_positions: Rest positions of the nodes of the sparse grid.
+    :param nb_nodes_regular_grid: Total number of nodes in the regular grid.
+    :return: Mapped indices from sparse to regular grid ('idx_sparse_to_regular'), mapped indices from regular to
+             sparse grid with -1 for empty nodes ('idx_regular_to_sparse') and rest positions on the regular grid
+             ('regular_grid_rest_shape').
+    """
+
+    indices_sparse_to_regular = asarray(indices_sparse_to_regular, dtype=int32)
+    indices_regular_to_sparse = full(nb_nodes_regular_grid, -1, dtype=int32)
+    indices_regular_to_sparse[indices_sparse_to_regular] = arange(len(indices_sparse_to_regular), dtype=int32)
+    regular_grid_rest_shape = zeros((nb_nodes_regular_grid, 3), dtype=float)
+    regular_grid_rest_shape[indices_sparse_to_regular] = asarray(rest_positions).reshape(-1, 3)
+    return {'idx_sparse_to_regular': indices_sparse_to_regular,
+            'idx_regular_to_sparse': indices_regular_to_sparse,
+            'regular_grid_rest_shape': regular_grid_rest_shape}
+
+
+def sparse_grid_correspondence(sparse_grid: Any,
+                               sparse_grid_mo: Any,
+                               nb_nodes_regular_grid: int,
+                               parameters: Optional[Dict[str, Any]] = None,
+                               cache_dir: Optional[str] = None) -> Dict[str, ndarray]:
+    """
+    Get the correspondence between a SparseGridTopology and the regular grid it is computed from. If parameters are
+    given, the correspondence is saved in an on-disk cache at first call and memory-mapped by the following calls.
+
+    :param sparse_grid: SparseGridTopology containing the sparse grid topology.
+    :param sparse_grid_mo: MechanicalObject containing the positions of the nodes in the sparse grid.
+    :param nb_nodes_regular_grid: Total number of nodes in the regular grid.
+    :param parameters: Parameters defining the cache key (mesh hash, grid resolution, bounding box...).
+    :param cache_dir: Path to the cache directory.
+    :return: Correspondence arrays, see grid_correspondence.
+    """
+
+    entry = None
+    if parameters is not None:
+        cache_dir = get_cache_dir('grids') if cache_dir is None else cache_dir
+        entry = join(cache_dir, hash_parameters(nb_nodes_regular_grid=nb_nodes_regular_grid, **parameters))
+        correspondence = load_arrays(entry)
+        if correspondence is not None:
+            return correspondence
+
+    rest_positions = sparse_grid_mo.rest_position.array()
+    nb_nodes = len(rest_positions)
+    # The nodes of the sparse grid lie on its regular grid, so their indices are computed from the positions at once
+    indices = regular_grid_indices(positions=rest_positions,
+                                   bbox_min=sparse_grid.min.value,
+                                   bbox_max=sparse_grid.max.value,
+                                   resolution=sparse_grid.n.value)
+    # Check a few nodes against SOFA, otherwise ask SOFA for every node
+    samples = arange(0, nb_nodes, max(nb_nodes // 16, 1))
+    if not array_equal(indices[samples], [sparse_grid.getRegularGridNodeIndex(int(i)) for i in samples]):
+        indices = fromiter(map(sparse_grid.getRegularGridNodeIndex, range(nb_nodes)), dtype=int32, count=nb_nodes)
+
+    correspondence = grid_correspondence(indices, rest_positions, nb_nodes_regular_grid)
+    if entry is not None:
+        save_arrays(entry, correspondence)
+    return correspondence
+
+
+class GridIncidence:
+
+    def __init__(self,
+                 rows: Sequence[Sequence[int]],
+                 nb_nodes_regular_grid: int):
+        """
+        GridIncidence stores the regular grid nodes associated to each point of a fixed set (e.g. the nodes of the
+        cell containing each surface node at rest) as CSR arrays, so that values defined on subsets of points are
+        scattered on the regular grid without Python loops.
+
+        :param rows: Regular grid nodes associated to each point, nodes out of the grid are ignored.
+        :param nb_nodes_regular_grid: Total number of nodes in the regular grid.
+        """
+
+        self.nb_nodes_regular_grid: int = nb_nodes_regular_grid
+        rows = [[node for node in row if 0 <= node < nb_nodes_regular_grid] for row in rows]
+        self.indptr: ndarray = zeros(len(rows) + 1, dtype=int64)
+        self.indptr[1:] = cumsum([len(row) for row in rows])
+        self.indices: ndarray = fromiter((node for row in rows for node in row), dtype=int32, count=self.indptr[-1])
+
+    def nodes_of(self,
+                 points: Sequence[int]) -> ndarray:
+        """
+        Get the regular grid nodes associated to a set of points.
+
+        :param points: Indices of the points.
+        :return: Concatenated regular grid nodes of each point, in the order of the points.
+        """
+
+        points = asarray(points, dtype=int64).reshape(-1)
+        starts, lengths = self.indptr[points], self.indptr[points + 1] - self.indptr[points]
+        # Position of each gathered entry in its row
+        offsets = arange(lengths.sum()) - repeat(cumsum(lengths) - lengths, lengths)
+        return self.indices[repeat(starts, lengths) + offsets]
+
+    def scatter(self,
+                sources: Sequence[Tuple[Sequence[int], ndarray]],
+                out: ndarray) -> ndarray:
+        """
+        Scatter values on the regular grid. A node receives the value of the first source it is associated to, null
+        values do not claim the nodes.
+
+        :param sources: Ordered list of (points, value) pairs, the value being written on every node associated to
+                        the points.
+        :param out: Array of shape (nb_nodes_regular_grid, ...) in which values are written, it is reset to zero.
+        :return: The out array.
+        """
+
+        out.fill(0)
+        nodes, source_ids, values = [], [], []
+        for points, value in sources:
+            value = asarray(value)
+            if not value.any():
+                continue
+            source_nodes = self.nodes_of(points)
+            nodes.append(source_nodes)
+            source_ids.append(full(len(source_nodes), len(values), dtype=int32))
+            values.append(value)
+        if len(values) == 0:
+            return out
+        # The first occurrence of each node gives its writer
+        nodes, first = unique(concatenate(nodes), return_index=True)
+        out[nodes] = asarray(values)[concatenate(source_ids)[first]]
+        return out
@@ -0,0 +1,83 @@
+from typing import Dict, List, Optional
+from numpy import ndarray, asarray, empty, copyto, multiply, add
+
+
+class PredictionInterpolator:
+
+    def __init__(self,
+                 stride: int,
+                 method: str = 'linear'):
+        """
+        PredictionInterpolator interpolates the predictions of the frames between two Network evaluations. The
+        interpolation between two consecutive predictions is only possible once the second one is known, so the
+        interpolated predictions are delayed by 'stride' frames.
+
+        :param stride: Number of frames between two Network evaluations.
+        :param method: Interpolation method, either 'linear' or 'spline' (cubic Hermite spline).
+        """
+
+        if type(stride) != int or stride < 1:
+            raise ValueError(f"[{self.__class__.__name__}] The stride must be a positive integer, got {stride}.")
+        if method not in ['linear', 'spline']:
+            raise ValueError(f"[{self.__class__.__name__}] The interpolation method must be either 'linear' or "
+                             f"'spline', got '{method}'.")
+        self.stride: int = stride
+        self.method: str = method
+
+        # The last three predictions are kept, the output and scratch buffers are reused
+        self.__keyframes: List[Dict[str, ndarray]] = []
+        self.__output: Dict[str, ndarray] = {}
+        self.__scratch: Dict[str, ndarray] = {}
+
+    def push(self,
+             prediction: Dict[str, ndarray]) -> None:
+        """
+        Add the prediction computed by the Network.
+
+        :param prediction: Prediction data.
+        """
+
+        # Re-use the buffers of the oldest prediction
+        keyframe = self.__keyframes.pop(0) if len(self.__keyframes) == 3 else {}
+        for field, value in prediction.items():
+            value = asarray(value)
+            if field not in keyframe or keyframe[field].shape != value.shape or keyframe[field].dtype != value.dtype:
+                keyframe[field] = empty(value.shape, dtype=value.dtype)
+            copyto(keyframe[field], value)
+        self.__keyframes.append(keyframe)
+
+    def get(self,
+            frame: int) -> Optional[Dict[str, ndarray]]:
+        """
+        Get the interpolated prediction of a frame.
+
+        :param frame: Index of the frame since the last Network evaluation, in [0, stride).
+        :return: Interpolated prediction, None if no prediction was pushed yet.
+        """
+
+        if len(self.__keyframes) < 2:
+            return None if len(self.__keyframes) == 0 else self.__keyframes[-1]
+
+        # Weights of the previous, last and before previous predictions
+        t = frame / self.stride
+        if self.method == 'linear' or len(self.__keyframes) < 3:
+            weights = (1. - t, t, 0.)
+        else:
+            # Hermite basis with the tangents (last - before_previous) / 2 and (last - previous)
+            h00, h10, h01, h11 = 2 * t ** 3 - 3 * t ** 2 + 1, t ** 3 - 2 * t ** 2 + t, -2 * t ** 3 + 3 * t ** 2, \
+                t ** 3 - t ** 2
+            weights = (h00 - h11, h10 / 2 + h01 + h11, -h10 / 2)
+
+        previous, last, before_previous = self.__keyframes[-2], self.__keyframes[-1], self.__keyframes[0]
+        for field, value in last.items():
+            if field not in self.__output or self.__output[field].shape != value.shape:
+                self.__output[field] = empty(value.shape, dtype=value.dtype)
+                self.__scratch[field] = empty(value.shape, dtype=value.dtype)
+            output, scratch = self.__output[field], self.__scratch[field]
+            multiply(previous[field], weights[0], out=output)
+            multiply(last[field], weights[1], out=scratch)
+            add(output, scratch, out=output)
+            if weights[2] != 0.:
+                multiply(before_previous[field], weights[2], out=scratch)
+                add(output, scratch, out=output)
+        return self.__output
@@ -0,0 +1,39 @@
+from typing import Dict, List, Callable, Any, Tuple
+from types import ModuleType
+from importlib import import_module
+from sys import modules
+
+
+def lazy_package(package: str,
+                 exports: Dict[str, str]) -> Tuple[List[str], Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Make the exported symbols of a package lazily imported (PEP 562): a module is only imported when one of its
+    symbols is accessed for the first time.
+
+    :param package: Name of the package.
+    :param exports: Exported symbols with the name of their module in the package.
+    :return: __all__, __getattr__ and __dir__ of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(import_module(f'{package}.{exports[name]}'), name)
+        ModuleType.__setattr__(modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(list(vars(modules[package]).keys()) + list(exports.keys())))
+
+    modules[package]._lazy_exports = exports
+    modules[package].__class__ = _LazyPackage
+    return list(exports.keys()), __getattr__, __dir__
+
+
+class _LazyPackage(ModuleType):
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Loaded submodules must not shadow the exported symbols of the same name
+        if isinstance(value, ModuleType) and name in self.__dict__.get('_lazy_exports', {}):
+            return
+        ModuleType.__setattr__(self, name, value)
@@ -0,0 +1,127 @@
+from typing import Dict, Optional, Sequence, Tuple, Union
+from os.path import join
+from re import sub
+from numpy import ndarray, asarray, array, concatenate, stack, unique, empty, flatnonzero, all as np_all, int64
+
+from DeepPhysX.Sofa.Utils.cache import get_cache_dir, hash_file, save_arrays, load_arrays
+
+
+def read_obj(file_path: str,
+             cache_dir: Optional[str] = None,
+             mmap: bool = True) -> Dict[str, ndarray]:
+    """
+    Read the vertices and the faces of an OBJ file with NumPy only. The parsed arrays are saved in a binary cache entry
+    keyed by the content of the file, which is memory-mapped by the following reads.
+
+    :param file_path: Path to the OBJ file.
+    :param cache_dir: Path to the cache directory.
+    :param mmap: If True, cached arrays are memory-mapped in read-only mode.
+    :return: Positions of the vertices ('points', shape (N, 3)) and triangles ('faces', shape (M, 3), polygons are
+             fan-triangulated and grouped by number of vertices), indices start from 0.
+    """
+
+    cache_dir = get_cache_dir('meshes') if cache_dir is None else cache_dir
+    entry = join(cache_dir, hash_file(file_path))
+    mesh = load_arrays(entry, mmap=mmap)
+    if mesh is None:
+        with open(file_path, 'rb') as file:
+            mesh = parse_obj(file.read())
+        save_arrays(entry, mesh)
+    return mesh
+
+
+def parse_obj(content: bytes) -> Dict[str, ndarray]:
+    """
+    Parse the vertex and face blocks of an OBJ file.
+
+    :param content: Content of the OBJ file.
+    :return: Positions of the vertices and triangles, see read_obj.
+    """
+
+    lines = content.splitlines()
+    # Vertices may have an additional weight or color components, only the positions are kept
+    vertices = [line.split()[1:] for line in lines if line.startswith(b'v ')]
+    sizes = unique([len(vertex) for vertex in vertices])
+    if len(sizes) == 1:
+        points = array(vertices, dtype=float).reshape(-1, sizes[0])[:, :3].copy()
+    else:
+        points = array([vertex[:3] for vertex in vertices], dtype=float).reshape(-1, 3)
+
+    # Texture and normal indices are removed, faces are grouped by number of vertices to be triangulated at once
+    faces = [sub(rb'/\S*', b'', line).split()[1:] for line in lines if line.startswith(b'f ')]
+    triangles = [empty((0, 3), dtype=int64)]
+    for size in unique([len(face) for face in faces]):
+        polygons = array([face for face in faces if len(face) == size], dtype=int64)
+        # Negative indices are relative to the end of the vertex list
+        polygons[polygons > 0] -= 1
+        polygons[polygons < 0] += len(points)
+        triangles += [stack([polygons[:, 0], polygons[:, i], polygons[:, i + 1]], axis=1) for i in range(1, size - 1)]
+    return {'points': points, 'faces': concatenate(triangles)}
+
+
+def bounding_box(points: ndarray,
+                 scale: Union[float, Sequence[float]] = 1.,
+                 margin_scale: float = 0.) -> Tuple[ndarray, ndarray]:
+    """
+    Compute the bounding box of a set of points.
+
+    :param points: Positions of the points.
+    :param scale: Scale to apply to the points.
+    :param margin_scale: Margin in percents of the size of the bounding box.
+    :return: Min lower and max upper corners of the bounding box.
+    """
+
+    bbox_min = points.min(axis=0) * asarray(scale)
+    bbox_max = points.max(axis=0) * asarray(scale)
+    # Apply a margin scale to the bounding box
+    bbox_min -= margin_scale * (bbox_max - bbox_min)
+    bbox_max += margin_scale * (bbox_max - bbox_min)
+    return bbox_min, bbox_max
+
+
+def center_of_mass(points: ndarray,
+                   scale: Union[float, Sequence[float]] = 1.) -> ndarray:
+    """
+    Compute the center of mass of a set of points, each point having the same weight.
+
+    :param points: Positions of the points.
+    :param scale: Scale to apply to the points.
+    :return: Center of mass.
+    """
+
+    return points.mean(axis=0) * asarray(scale)
+
+
+def extremity(points: ndarray,
+              axis: int,
+              maximum: bool = True,
+              box: Optional[Sequence[float]] = None) -> ndarray:
+    """
+    Find the extreme point of a set of points along an axis.
+
+    :param points: Positions of the points.
+    :param axis: Axis along which the extremity is searched.
+    :param maximum: If True, the point with the largest coordinate is returned, the smallest otherwise.
+    :param box: If set, only the points in this box are considered, see box_roi.
+    :return: Position of the extreme point.
+    """
+
+    candidates = points if box is None else points[box_roi(points, box)]
+    if len(candidates) == 0:
+        raise ValueError(f"[extremity] No point found in the box {box}.")
+    index = candidates[:, axis].argmax() if maximum else candidates[:, axis].argmin()
+    return asarray(candidates[index])
+
+
+def box_roi(points: ndarray,
+            box: Sequence[float]) -> ndarray:
+    """
+    Find the points inside a box, as a BoxROI does.
+
+    :param points: Positions of the points.
+    :param box: Box defined by [xmin, ymin, zmin, xmax, ymax, zmax], infinite bounds are allowed.
+    :return: Indices of the points inside the box.
+    """
+
+    box = asarray(box, dtype=float)
+    return flatnonzero(np_all((points >= box[:3]) & (points <= box[3:]), axis=1))
@@ -0,0 +1,99 @@
+from typing import Dict, Optional, List
+from collections import OrderedDict
+from hashlib import blake2b
+from numpy import ndarray, asarray, rint
+
+
+class PredictionCache:
+
+    def __init__(self,
+                 max_size: int = 128,
+                 quantization: Optional[float] = None,
+                 fields: Optional[List[str]] = None):
+        """
+        PredictionCache is a bounded LRU cache of Network predictions, keyed by a hash of the Network inputs.
+
+        :param max_size: Maximum number of cached predictions, the least recently used one is removed first.
+        :param quantization: If set, inputs are rounded to this step before being hashed so that close inputs share the
+                             same prediction.
+        :param fields: Names of the input fields used as key, every field is used if None.
+        """
+
+        if type(max_size) != int or max_size < 1:
+            raise ValueError(f"[{self.__class__.__name__}] The cache size must be a positive integer, got {max_size}.")
+        if quantization is not None and quantization <= 0:
+            raise ValueError(f"[{self.__class__.__name__}] The quantization step must be positive, got "
+                             f"{quantization}.")
+        self.max_size: int = max_size
+        self.quantization: Optional[float] = quantization
+        self.fields: Optional[List[str]] = fields
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__predictions: OrderedDict = OrderedDict()
+
+    def key(self,
+            inputs: Dict[str, ndarray]) -> bytes:
+        """
+        Compute the fingerprint of a set of inputs.
+
+        :param inputs: Network inputs.
+        :return: Digest of the inputs.
+        """
+
+        digest = blake2b(digest_size=16)
+        for field in sorted(inputs.keys()) if self.fields is None else self.fields:
+            value = asarray(inputs[field])
+            if self.quantization is not None:
+                value = rint(value / self.quantization).astype('int64')
+            digest.update(field.encode())
+            digest.update(str((value.dtype, value.shape)).encode())
+            digest.update(value.tobytes())
+        return digest.digest()
+
+    def get(self,
+            key: bytes) -> Optional[Dict[str, ndarray]]:
+        """
+        Get a cached prediction.
+
+        :param key: Fingerprint of the inputs.
+        :return: Cached prediction or None if the inputs were not predicted yet.
+        """
+
+        prediction = self.__predictions.get(key)
+        if prediction is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.__predictions.move_to_end(key)
+        return prediction
+
+    def put(self,
+            key: bytes,
+            prediction: Dict[str, ndarray]) -> None:
+        """
+        Add a prediction in the cache.
+
+        :param key: Fingerprint of the inputs.
+        :param prediction: Prediction of the Network, arrays must not be modified afterwards.
+        """
+
+        self.__predictions[key] = prediction
+        self.__predictions.move_to_end(key)
+        if len(self.__predictions) > self.max_size:
+            self.__predictions.popitem(last=False)
+
+    def __len__(self):
+
+        return len(self.__predictions)
+
+    def __str__(self):
+        """
+        :return: String containing information about the PredictionCache object
+        """
+
+        description = "\n"
+        description += f"  {self.__class__.__name__}\n"
+        description += f"    Size: {len(self)} / {self.max_size}\n"
+        description += f"    Hits: {self.hits}\n"
+        description += f"    Misses: {self.misses}\n"
+        return description
@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Tuple
+from os import makedirs, listdir, rename
+from os.path import join, isdir
+from threading import Thread
+from queue import Queue
+from numpy import ndarray, asarray, empty, copyto, save, load, concatenate
+
+
+class ChunkedRecorder:
+
+    def __init__(self,
+                 directory: str,
+                 chunk_size: int = 256,
+                 max_pending_chunks: int = 2):
+        """
+        ChunkedRecorder streams samples to disk in fixed-size chunks written by a background thread. The memory used
+        is bounded by the chunk size and the number of pending chunks, whatever the length of the recording.
+
+        :param directory: Directory in which the chunks are written.
+        :param chunk_size: Number of samples per chunk.
+        :param max_pending_chunks: Maximum number of full chunks waiting to be written. The recording waits for the
+                                   writer if the limit is reached.
+        """
+
+        if type(chunk_size) != int or chunk_size < 1:
+            raise ValueError(f"[{self.__class__.__name__}] The chunk size must be a positive integer, got "
+                             f"{chunk_size}.")
+        self.directory: str = directory
+        makedirs(self.directory, exist_ok=True)
+        self.chunk_size: int = chunk_size
+        self.nb_samples: int = 0
+        self.nb_chunks: int = 0
+
+        # Chunk buffers are recycled once written
+        self.__free_chunks: Queue = Queue()
+        self.__pending_chunks: Queue = Queue(maxsize=max_pending_chunks)
+        self.__chunk: Optional[Dict[str, ndarray]] = None
+        self.__chunk_length: int = 0
+        self.__writer = Thread(target=self.__write_chunks, daemon=True)
+        self.__writer.start()
+
+    def append(self,
+               sample: Dict[str, ndarray]) -> None:
+        """
+        Copy a sample in the current chunk.
+
+        :param sample: Fields of the sample.
+        """
+
+        sample = {field: asarray(value) for field, value in sample.items()}
+        # A new chunk is started if the layout of the samples changed
+        if self.__chunk is not None and (self.__chunk.keys() != sample.keys() or
+                                         any([self.__chunk[field].shape[1:] != value.shape or
+                                              self.__chunk[field].dtype != value.dtype
+                                              for field, value in sample.items()])):
+            self.flush()
+        if self.__chunk is None:
+            self.__chunk = self.__get_chunk(sample)
+        for field, value in sample.items():
+            copyto(self.__chunk[field][self.__chunk_length], value)
+        self.__chunk_length += 1
+        self.nb_samples += 1
+        if self.__chunk_length == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send the current chunk to the writer, even if it is not full.
+        """
+
+        if self.__chunk is not None and self.__chunk_length > 0:
+            self.__pending_chunks.put((self.nb_chunks, self.__chunk, self.__chunk_length))
+            self.nb_chunks += 1
+        self.__chunk, self.__chunk_length = None, 0
+
+    def close(self) -> None:
+        """
+        Write the remaining samples and stop the writer.
+        """
+
+        self.flush()
+        self.__pending_chunks.put(None)
+        self.__writer.join()
+
+    def __get_chunk(self,
+                    sample: Dict[str, ndarray]) -> Dict[str, ndarray]:
+        """
+        Get chunk buffers for a sample layout, a written chunk is recycled if it has the same layout.
+
+        :param sample: Fields of the sample.
+        :return: Chunk buffers.
+        """
+
+        while not self.__free_chunks.empty():
+            chunk = self.__free_chunks.get()
+            if chunk.keys() == sample.keys() and all([chunk[field].shape[1:] == value.shape and
+                                                      chunk[field].dtype == value.dtype
+                                                      for field, value in sample.items()]):
+                return chunk
+        return {field: empty((self.chunk_size,) + value.shape, dtype=value.dtype) for field, value in sample.items()}
+
+    def __write_chunks(self) -> None:
+        """
+        Write the pending chunks, each field of a chunk in its own file.
+        """
+
+        while True:
+            item = self.__pending_chunks.get()
+            if item is None:
+                return
+            chunk_id, chunk, length = item
+            for field, value in chunk.items():
+                # Files only appear once fully written
+                file = join(self.directory, f'{field}_{chunk_id:06d}.npy')
+                with open(f'{file}.tmp', 'wb') as tmp_file:
+                    save(tmp_file, value[:length], allow_pickle=False)
+                rename(f'{file}.tmp', file)
+            self.__free_chunks.put(chunk)
+
+
+def load_recording(directory: str,
+                   fields: Optional[List[str]] = None,
+                   mmap: bool = True) -> Dict[str, ndarray]:
+    """
+    Load the samples written by a ChunkedRecorder.
+
+    :param directory: Directory of the recording.
+    :param fields: Fields to load, every field is loaded if None.
+    :param mmap: If True, chunks are memory-mapped before being concatenated.
+    :return: Recorded samples of each field.
+    """
+
+    if not isdir(directory):
+        return {}
+    chunks: Dict[str, List[Tuple[int, str]]] = {}
+    for file in listdir(directory):
+        if file.endswith('.npy'):
+            field, chunk_id = file[:-len('.npy')].rsplit('_', 1)
+            if fields is None or field in fields:
+                chunks.setdefault(field, []).append((int(chunk_id), file))
+    # Chunks are ordered by their index, which may have more digits than the zero-padding
+    return {field: concatenate([load(join(directory, file), mmap_mode='r' if mmap else None)
+                                for _, file in sorted(files)])
+            for field, files in chunks.items()}
@@ -0,0 +1,142 @@
+from typing import Dict, List
+from contextlib import contextmanager
+from time import perf_counter
+from threading import Lock
+from math import log10
+import json
+
+
+class LatencyHistogram:
+
+    def __init__(self,
+                 min_latency: float = 1e-6,
+                 max_latency: float = 1e3,
+                 bins_per_decade: int = 50):
+        """
+        LatencyHistogram counts latencies in logarithmic bins, so that the memory does not depend on the number of
+        measures. Percentiles are estimated with a relative error bounded by the bin width.
+
+        :param min_latency: Lower bound of the histogram in seconds.
+        :param max_latency: Upper bound of the histogram in seconds.
+        :param bins_per_decade: Number of bins per power of ten.
+        """
+
+        self.min_latency: float = min_latency
+        self.bins_per_decade: int = bins_per_decade
+        self.bins: List[int] = [0] * (int(log10(max_latency / min_latency) * bins_per_decade) + 1)
+        self.count: int = 0
+        self.total: float = 0.
+        self.max: float = 0.
+
+    def add(self,
+            latency: float) -> None:
+        """
+        Add a measure.
+
+        :param latency: Latency in seconds.
+        """
+
+        index = int(log10(latency / self.min_latency) * self.bins_per_decade) if latency > self.min_latency else 0
+        self.bins[min(index, len(self.bins) - 1)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self,
+                   q: float) -> float:
+        """
+        Estimate a percentile of the latencies.
+
+        :param q: Percentile in [0, 100].
+        :return: Estimated latency in seconds, the geometric center of the bin containing the percentile.
+        """
+
+        if self.count == 0:
+            return 0.
+        rank, cumulated = q / 100 * self.count, 0
+        for index, count in enumerate(self.bins):
+            cumulated += count
+            if cumulated >= rank and count > 0:
+                return min(self.min_latency * 10 ** ((index + 0.5) / self.bins_per_decade), self.max)
+        return self.max
+
+
+class PhaseTimer:
+
+    def __init__(self):
+        """
+        PhaseTimer measures the latency of named phases in LatencyHistograms. Phases can be measured from several
+        threads.
+        """
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.__lock = Lock()
+
+    @contextmanager
+    def measure(self,
+                phase: str):
+        """
+        Measure the latency of the code executed in the context.
+
+        :param phase: Name of the phase.
+        """
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start)
+
+    def add(self,
+            phase: str,
+            latency: float) -> None:
+        """
+        Add a measure of a phase.
+
+        :param phase: Name of the phase.
+        :param latency: Latency in seconds.
+        """
+
+        with self.__lock:
+            if phase not in self.histograms:
+                self.histograms[phase] = LatencyHistogram()
+            self.histograms[phase].add(latency)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the statistics of each phase.
+
+        :return: Number of measures, mean, p50, p95, p99 and max latencies of each phase, in seconds.
+        """
+
+        with self.__lock:
+            return {phase: {'count': histogram.count,
+                            'mean': histogram.total / max(histogram.count, 1),
+                            'p50': histogram.percentile(50),
+                            'p95': histogram.percentile(95),
+                            'p99': histogram.percentile(99),
+                            'max': histogram.max}
+                    for phase, histogram in self.histograms.items()}
+
+    def save(self,
+             file_path: str) -> None:
+        """
+        Save the statistics of each phase in a JSON file.
+
+        :param file_path: Path to the file.
+        """
+
+        with open(file_path, 'w') as file:
+            json.dump(self.summary(), file, indent=4)
+
+    def __str__(self):
+        """
+        :return: String containing the statistics of each phase
+        """
+
+        description = "\n"
+        description += f"  {self.__class__.__name__}\n"
+        for phase, stats in self.summary().items():
+            description += f"    {phase}: p50 {stats['p50'] * 1e3:.3f} ms, p95 {stats['p95'] * 1e3:.3f} ms, " \
+                           f"p99 {stats['p99'] * 1e3:.3f} ms ({stats['count']} measures)\n"
+        return description
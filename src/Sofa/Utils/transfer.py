@@ -0,0 +1,132 @@
+from typing import Sequence, Tuple
+from numpy import ndarray, asarray, arange, ones, floor, clip, stack, moveaxis, ascontiguousarray, int64
+
+# scipy is an optional dependency, only required by the transfer operators
+try:
+    from scipy.sparse import csr_matrix, spmatrix
+except ImportError as error:
+    raise ImportError("[transfer] The transfer operators require scipy, install it with "
+                      "'pip install DeepPhysX.Sofa[transfer]'.") from error
+
+
+class TransferOperator:
+
+    def __init__(self,
+                 matrix: spmatrix):
+        """
+        TransferOperator is a sparse linear map between two sets of nodes (sparse grid, regular grid, surface...).
+        Values of shape (N, d) or batches of shape (B, N, d) are mapped with a single sparse matrix product.
+
+        :param matrix: Sparse matrix of shape (nb_output_nodes, nb_input_nodes).
+        """
+
+        self.matrix: csr_matrix = csr_matrix(matrix)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        :return: Number of output nodes and number of input nodes.
+        """
+
+        return self.matrix.shape
+
+    def apply(self,
+              values: ndarray) -> ndarray:
+        """
+        Map values defined on the input nodes to the output nodes.
+
+        :param values: Values of shape (nb_input_nodes, d) or batch of values of shape (B, nb_input_nodes, d).
+        :return: Mapped values of shape (nb_output_nodes, d) or (B, nb_output_nodes, d).
+        """
+
+        values = asarray(values)
+        if values.ndim == 2:
+            return self.matrix @ values
+        if values.ndim != 3:
+            raise ValueError(f"[{self.__class__.__name__}] Values must be of shape (N, d) or (B, N, d), got "
+                             f"{values.shape}.")
+        # The batch is laid out as columns so that the whole batch is mapped with one product
+        batch_size, nb_nodes, dim = values.shape
+        columns = moveaxis(values, 1, 0).reshape(nb_nodes, batch_size * dim)
+        mapped = (self.matrix @ columns).reshape(self.shape[0], batch_size, dim)
+        return ascontiguousarray(moveaxis(mapped, 1, 0))
+
+    def transpose(self) -> 'TransferOperator':
+        """
+        :return: Transposed operator, mapping the output nodes to the input nodes.
+        """
+
+        return TransferOperator(self.matrix.T)
+
+    def __matmul__(self,
+                   other: 'TransferOperator') -> 'TransferOperator':
+        """
+        :param other: Operator applied first.
+        :return: Composition of the operators.
+        """
+
+        return TransferOperator(self.matrix @ other.matrix)
+
+
+def prolongation(indices_sparse_to_regular: Sequence[int],
+                 nb_nodes_regular_grid: int) -> TransferOperator:
+    """
+    Get the operator mapping the nodes of a sparse grid to the nodes of its regular grid. Empty nodes of the regular
+    grid receive zero.
+
+    :param indices_sparse_to_regular: Index in the regular grid of each node of the sparse grid.
+    :param nb_nodes_regular_grid: Total number of nodes in the regular grid.
+    :return: Operator of shape (nb_nodes_regular_grid, nb_nodes_sparse_grid).
+    """
+
+    indices = asarray(indices_sparse_to_regular, dtype=int64)
+    return TransferOperator(csr_matrix((ones(len(indices)), (indices, arange(len(indices)))),
+                                       shape=(nb_nodes_regular_grid, len(indices))))
+
+
+def restriction(indices_sparse_to_regular: Sequence[int],
+                nb_nodes_regular_grid: int) -> TransferOperator:
+    """
+    Get the operator mapping the nodes of a regular grid to the nodes of its sparse grid.
+
+    :param indices_sparse_to_regular: Index in the regular grid of each node of the sparse grid.
+    :param nb_nodes_regular_grid: Total number of nodes in the regular grid.
+    :return: Operator of shape (nb_nodes_sparse_grid, nb_nodes_regular_grid).
+    """
+
+    return prolongation(indices_sparse_to_regular, nb_nodes_regular_grid).transpose()
+
+
+def interpolation(positions: ndarray,
+                  bbox_min: Sequence[float],
+                  bbox_max: Sequence[float],
+                  resolution: Sequence[int]) -> TransferOperator:
+    """
+    Get the operator mapping the nodes of a regular grid to a set of points (e.g. surface nodes at rest) with the
+    trilinear interpolation of the cell containing each point, as a BarycentricMapping on the grid does. Nodes are
+    numbered along x first, then y, then z.
+
+    :param positions: Positions of the points.
+    :param bbox_min: Min lower corner of the regular grid.
+    :param bbox_max: Max upper corner of the regular grid.
+    :param resolution: Number of nodes of the regular grid in each direction.
+    :return: Operator of shape (nb_points, nb_nodes_regular_grid).
+    """
+
+    bbox_min, bbox_max = asarray(bbox_min, dtype=float), asarray(bbox_max, dtype=float)
+    resolution = asarray(resolution, dtype=int64)
+    positions = asarray(positions, dtype=float).reshape(-1, 3)
+    coordinates = (positions - bbox_min) / ((bbox_max - bbox_min) / (resolution - 1))
+    # Cell containing each point and local coordinates in the cell, points on the upper faces use the last cell
+    cells = clip(floor(coordinates), 0, resolution - 2).astype(int64)
+    local = clip(coordinates - cells, 0., 1.)
+
+    rows, columns, weights = [], [], []
+    for corner in [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]:
+        ijk = cells + corner
+        columns.append(ijk[:, 0] + resolution[0] * (ijk[:, 1] + resolution[1] * ijk[:, 2]))
+        factors = [local[:, axis] if corner[axis] else 1. - local[:, axis] for axis in range(3)]
+        weights.append(factors[0] * factors[1] * factors[2])
+        rows.append(arange(len(positions)))
+    return TransferOperator(csr_matrix((stack(weights).ravel(), (stack(rows).ravel(), stack(columns).ravel())),
+                                       shape=(len(positions), int(resolution.prod()))))
@@ -1,3 +1,5 @@
+import numpy as np
+
 from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
 
 
@@ -36,3 +38,42 @@ class TestEnvironment(SofaEnvironment):
     def onAnimateBeginEvent(self, event):
         # Assert method is called
         self.call_step = True
+
+
+class TestStepEnvironment(SofaEnvironment):
+
+    def __init__(self, as_tcp_ip_client=False, instance_id=1, instance_nb=1):
+        SofaEnvironment.__init__(self, as_tcp_ip_client=as_tcp_ip_client, instance_id=instance_id,
+                                 instance_nb=instance_nb)
+
+        # Count hooks calls
+        self.nb_begin_events = 0
+        self.nb_end_events = 0
+        self.nb_on_step = 0
+        self.closed = False
+        self.sent_samples = []
+        self.create_dtype = None
+
+    def create(self):
+        self.create_dtype = self.dtype
+        self.root.addChild('object')
+        self.root.object.addObject('MechanicalObject', name='MO', position=[[0., 0., 0.], [1., 1., 1.]])
+
+    def onAnimateBeginEvent(self, event):
+        self.nb_begin_events += 1
+
+    def onAnimateEndEvent(self, event):
+        self.nb_end_events += 1
+        self.set_training_data(input=np.array([float(self.nb_end_events)]))
+
+    async def on_step(self):
+        self.nb_on_step += 1
+
+    def _send_training_data(self):
+        # Sent samples are kept with the number of animated steps instead of being written in the Database
+        self.sent_samples.append((self.nb_end_events, self._get_last_training_data()['input'].copy()))
+        return [0, len(self.sent_samples)]
+
+    def close(self):
+        SofaEnvironment.close(self)
+        self.closed = True
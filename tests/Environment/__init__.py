@@ -1,2 +1,2 @@
-from .tests_SofaEnvironment import TestSofaEnvironment
+from .tests_SofaEnvironment import TestSofaEnvironment, TestSofaEnvironmentStep
 from .tests_SofaEnvironmentConfig import TestSofaEnvironmentConfig
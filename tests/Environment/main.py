@@ -3,7 +3,7 @@ from os import devnull
 from sys import stdout
 
 from tests_SofaEnvironmentConfig import TestSofaEnvironmentConfig
-from tests_SofaEnvironment import TestSofaEnvironment
+from tests_SofaEnvironment import TestSofaEnvironment, TestSofaEnvironmentStep
 
 
 if __name__ == '__main__':
@@ -1,10 +1,12 @@
 from unittest import TestCase
 from asyncio import run
+from threading import enumerate as threads
 import numpy as np
 import Sofa
 
 from DeepPhysX.Sofa.Environment.SofaEnvironment import SofaEnvironment
-from TestEnvironment import TestEnvironment
+from DeepPhysX.Sofa.Environment.VectorizedSofaEnvironment import VectorizedSofaEnvironment
+from TestEnvironment import TestEnvironment, TestStepEnvironment
 
 
 class TestSofaEnvironment(TestCase):
@@ -38,3 +40,142 @@ class TestSofaEnvironment(TestCase):
         run(self.env.step())
         for attribute in [self.env.call_create, self.env.call_init, self.env.call_step]:
             self.assertTrue(attribute)
+
+
+class TestSofaEnvironmentStep(TestCase):
+
+    def setUp(self):
+        self.env = TestStepEnvironment()
+        self.env.create()
+        self.env.init()
+
+    def test_substeps(self):
+        # Sub-steps are fused, hooks are only triggered on the last one
+        self.env.simulations_per_step = 5
+        run(self.env.step())
+        self.assertAlmostEqual(self.env.root.time.value, 5 * self.env.root.dt.value)
+        for attribute in [self.env.nb_begin_events, self.env.nb_end_events, self.env.nb_on_step]:
+            self.assertEqual(attribute, 1)
+        self.assertTrue(self.env.listening.value)
+        # Timings are reported
+        stats = self.env.get_substep_statistics()
+        self.assertEqual(stats['nb_steps'], 1)
+        self.assertEqual(stats['nb_substeps'], 5)
+
+    def test_pipelined(self):
+        # The animation is computed in background, the next one only starts once a sample is sent
+        self.env._configure(pipelined=True)
+        run(self.env.step())
+        run(self.env.step())
+        self.assertEqual(self.env.nb_on_step, 2)
+        self.assertEqual(self.env.nb_begin_events, 2)
+        self.assertIn('TestStepEnvironment', [thread.name.split('_')[0] for thread in threads()])
+        # The background thread is shut down on close
+        self.env.close()
+        self.assertTrue(self.env.closed)
+        self.assertNotIn('TestStepEnvironment', [thread.name.split('_')[0] for thread in threads()])
+
+    def test_pipelined_samples(self):
+        # Each sent sample is the one of its step, the next animation only starts once the sample is reset
+        self.env._configure(pipelined=True)
+        for step in range(1, 4):
+            run(self.env.step())
+            self.assertTrue(self.env.check_sample())
+            self.env._send_training_data()
+            self.env._reset_training_data()
+            self.assertEqual(self.env.sent_samples[-1][0], step)
+            self.assertTrue(np.array_equal(self.env.sent_samples[-1][1], [step]))
+        self.env.close()
+
+    def test_vectorized(self):
+        # Scenes are created as children of a single root node
+        env = VectorizedSofaEnvironment(environment_class=TestStepEnvironment, nb_scenes=3, as_tcp_ip_client=False)
+        env.create()
+        env.init()
+        self.assertEqual(len(env.root.children), 3)
+        # A single step animates every scene once
+        run(env.step())
+        for scene in env.environments:
+            self.assertEqual(scene.nb_begin_events, 1)
+            self.assertEqual(scene.nb_on_step, 1)
+
+    def test_vectorized_checkpoint(self):
+        # The initial state of each scene is saved once the shared root node is initialized
+        env = VectorizedSofaEnvironment(environment_class=TestStepEnvironment, nb_scenes=2, as_tcp_ip_client=False)
+        env.create()
+        for environment in env.environments:
+            environment.define_checkpoint(mechanical_objects=['@object.MO'])
+        env.init()
+        initial = [environment.root.object.MO.position.array().copy() for environment in env.environments]
+        for environment in env.environments:
+            environment.root.object.MO.position.value = environment.root.object.MO.position.array() + 1.
+        # Restoring the vectorized Environment restores every scene
+        env.restore_checkpoint()
+        for environment, position in zip(env.environments, initial):
+            self.assertTrue(np.array_equal(environment.root.object.MO.position.value, position))
+        # Saving the vectorized Environment saves every scene
+        for environment in env.environments:
+            environment.root.object.MO.position.value = environment.root.object.MO.position.array() + 1.
+        env.save_checkpoint()
+        env.restore_checkpoint()
+        for environment, position in zip(env.environments, initial):
+            self.assertTrue(np.array_equal(environment.root.object.MO.position.value, position + 1.))
+
+    def test_training_sample(self):
+        # A sample read by another component is not read again from the Database
+        self.env._set_training_sample([0, 1], {'id': 1, 'input': np.ones(3)}, {'id': 1})
+        self.env._get_training_data([0, 1])
+        self.assertEqual(self.env.update_line, [0, 1])
+        self.assertTrue(np.array_equal(self.env.sample_training['input'], np.ones(3)))
+        self.assertIsNone(self.env.sample_additional)
+
+    def test_bindings(self):
+        # Displacement of the MechanicalObject is computed into a reused buffer
+        self.env.bind_training_field(field='ground_truth', mechanical_object='@object.MO', quantity='displacement')
+        mo = self.env.root.object.MO
+        mo.position.value = mo.rest_position.array() + 1.
+        data = self.env._get_bound_data()
+        self.assertTrue(np.array_equal(data['ground_truth'], np.ones((2, 3))))
+        self.assertIs(self.env._get_bound_data()['ground_truth'], data['ground_truth'])
+        # Gathered and scattered nodes
+        self.env.bind_training_field(field='input', mechanical_object=mo, quantity='position', indices=np.array([1]),
+                                     scatter=np.array([2]), size=3)
+        self.assertTrue(np.array_equal(self.env._get_bound_data()['input'], [[0., 0., 0.], [0., 0., 0.], [2., 2., 2.]]))
+
+    def test_checkpoint(self):
+        # The checkpoint is saved at init
+        mo = self.env.root.object.MO
+        self.env.define_checkpoint(mechanical_objects=['@object.MO'])
+        self.env.save_checkpoint()
+        initial = mo.position.array().copy()
+        mo.position.value = initial + 1.
+        # Restoring only copies the saved vectors back
+        self.env.restore_checkpoint()
+        self.assertTrue(np.array_equal(mo.position.value, initial))
+
+    def test_precision(self):
+        # Bound fields are computed in the precision of the Environment
+        self.env._configure(precision='float32')
+        self.env.bind_training_field(field='ground_truth', mechanical_object='@object.MO', quantity='position')
+        data = self.env._get_bound_data()
+        self.assertEqual(data['ground_truth'].dtype, np.float32)
+        self.assertTrue(np.allclose(data['ground_truth'], self.env.root.object.MO.position.array()))
+
+    def test_apply_displacement(self):
+        # Positions are written in place from the rest positions
+        mo = self.env.root.object.MO
+        rest_position = mo.rest_position.array().copy()
+        self.env.apply_displacement('@object.MO', np.ones(6, dtype=np.float32))
+        self.assertTrue(np.allclose(mo.position.value, rest_position + 1.))
+        # Gathered nodes of a larger displacement field
+        displacement = np.arange(9, dtype=np.float64).reshape((3, 3))
+        self.env.apply_displacement(mo, displacement, indices=np.array([2, 0]))
+        self.assertTrue(np.allclose(mo.position.value, rest_position + displacement[[2, 0]]))
+        # ValueError
+        with self.assertRaises(ValueError):
+            self.env.apply_displacement(mo, displacement, indices=np.array([2, 0, 1]))
+        with self.assertRaises(ValueError):
+            self.env.apply_displacement(mo, displacement[:2], indices=np.array([2, 0]))
+        # Indices are validated at each call, not only when the scratch array is allocated
+        with self.assertRaises(ValueError):
+            self.env.apply_displacement(mo, displacement, indices=np.array([2, 3]))
@@ -1,7 +1,10 @@
 from unittest import TestCase
+import numpy as np
 import Sofa
 
 from DeepPhysX.Sofa.Environment.SofaEnvironmentConfig import SofaEnvironmentConfig
+from DeepPhysX.Sofa.Environment.VectorizedSofaEnvironment import VectorizedSofaEnvironment
+from DeepPhysX.Sofa.Environment.launcherSofaEnvironment import configured_environment
 import TestEnvironment as Env
 
 
@@ -43,6 +46,27 @@ class TestSofaEnvironmentConfig(TestCase):
         self.assertEqual(environment_config.max_wrong_samples_per_step, 10)
         self.assertEqual(environment_config.visualizer, None)
 
+    def test_clients_options(self):
+        # ValueError
+        with self.assertRaises(ValueError):
+            SofaEnvironmentConfig(environment_class=Env.TestEnvironment, client_start_method='spawn')
+        # Default values
+        environment_config = SofaEnvironmentConfig(environment_class=Env.TestEnvironment)
+        self.assertEqual(environment_config.client_start_method, 'subprocess')
+        # The number of fused sub-steps is kept in the public attribute and passed to the Environments
+        environment_config = SofaEnvironmentConfig(environment_class=Env.TestEnvironment, simulations_per_step=5)
+        self.assertEqual(environment_config.simulations_per_step, 5)
+        self.assertEqual(environment_config.get_environment_options()['simulations_per_step'], 5)
+
+    def test_client_environment(self):
+        # The options are applied by the client before the scene is created
+        environment_config = SofaEnvironmentConfig(environment_class=Env.TestStepEnvironment, precision='float32')
+        create_environment = configured_environment(environment_class=Env.TestStepEnvironment,
+                                                    options=environment_config.get_environment_options())
+        environment = create_environment(as_tcp_ip_client=True, instance_id=1, instance_nb=1)
+        environment.create()
+        self.assertEqual(environment.create_dtype, np.float32)
+
     def test_create_environment(self):
         # ValueError
         with self.assertRaises(ValueError):
@@ -59,6 +83,19 @@ class TestSofaEnvironmentConfig(TestCase):
         self.assertTrue(environment.call_create)
         self.assertTrue(environment.call_init)
 
+    def test_create_vectorized_environment(self):
+        # ValueError
+        with self.assertRaises(ValueError):
+            SofaEnvironmentConfig(environment_class=Env.TestStepEnvironment, nb_scenes=0)
+        with self.assertRaises(ValueError):
+            SofaEnvironmentConfig(environment_class=Env.TestStepEnvironment, nb_scenes=2, as_tcp_ip_client=True)
+        # Scenes are gathered in a VectorizedSofaEnvironment
+        environment_config = SofaEnvironmentConfig(environment_class=Env.TestStepEnvironment, nb_scenes=2,
+                                                   as_tcp_ip_client=False)
+        environment = environment_config.create_environment()
+        self.assertIsInstance(environment, VectorizedSofaEnvironment)
+        self.assertEqual(len(environment.environments), 2)
+
     def test_create_server(self):
         parameters = {'multiply_by_2': 10,
                       'multiply_by_4': 10}
@@ -67,6 +104,7 @@ class TestSofaEnvironmentConfig(TestCase):
         server = environment_config.create_server(environment_manager=None)
         # Check client and server are connected
         self.assertTrue(environment_config.server_is_ready)
+        self.assertGreater(environment_config.spin_up_latency, 0.)
         # Check the exchange of parameters : send a dict, receive a modified dict of parameters
         self.assertEqual(len(environment_config.received_parameters.keys()), 1)
         self.assertEqual(parameters.keys(), environment_config.received_parameters[0].keys())
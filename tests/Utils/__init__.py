@@ -0,0 +1,9 @@
+from .tests_prediction_cache import TestPredictionCache
+from .tests_interpolation import TestPredictionInterpolator
+from .tests_timing import TestPhaseTimer
+from .tests_recorder import TestChunkedRecorder
+from .tests_grid import TestGridCorrespondence, TestGridIncidence
+from .tests_transfer import TestTransferOperator
+from .tests_cache import TestCachedValues
+from .tests_mesh import TestMesh
+from .tests_batch import TestPredictBatch
@@ -0,0 +1,18 @@
+import unittest
+from os import devnull
+from sys import stdout
+
+from tests_prediction_cache import TestPredictionCache
+from tests_interpolation import TestPredictionInterpolator
+from tests_timing import TestPhaseTimer
+from tests_recorder import TestChunkedRecorder
+from tests_grid import TestGridCorrespondence, TestGridIncidence
+from tests_transfer import TestTransferOperator
+from tests_cache import TestCachedValues
+from tests_mesh import TestMesh
+from tests_batch import TestPredictBatch
+
+
+if __name__ == '__main__':
+    stdout = open(devnull, 'w')
+    unittest.main()
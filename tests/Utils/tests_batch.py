@@ -0,0 +1,97 @@
+from unittest import TestCase
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.batch import predict_batch
+from DeepPhysX.Sofa.Utils.timing import PhaseTimer
+
+
+class NetworkStub:
+
+    def __init__(self):
+        self.net_fields = ['input']
+        self.pred_norm_fields = {'prediction': 'ground_truth'}
+        self.weights = np.random.default_rng(0).random((3, 3))
+        self.nb_forwards = 0
+
+    def predict(self, data_net):
+        # Linear map of the nodes of each sample
+        self.nb_forwards += 1
+        return {'prediction': data_net['input'] @ self.weights + 1.}
+
+    @staticmethod
+    def numpy_to_tensor(data):
+        return np.array(data)
+
+    @staticmethod
+    def tensor_to_numpy(data):
+        return np.array(data)
+
+
+class DataTransformationStub:
+
+    @staticmethod
+    def transform_before_prediction(data_net):
+        return data_net
+
+    @staticmethod
+    def transform_before_loss(data_pred):
+        return data_pred, None
+
+    @staticmethod
+    def transform_before_apply(data_pred):
+        return data_pred
+
+
+class NetworkManagerStub:
+
+    def __init__(self):
+        self.network = NetworkStub()
+        self.data_transformation = DataTransformationStub()
+
+    @classmethod
+    def normalize_data(cls, data, normalization, reverse=False):
+        if reverse:
+            return (data * normalization[1]) + normalization[0]
+        return (data - normalization[0]) / normalization[1]
+
+    def compute_online_prediction(self, sample, normalization):
+        # Reference single sample forward, as done by the NetworkManager with a batch of one
+        sample = {field: self.network.numpy_to_tensor(self.normalize_data(np.array([value]), normalization[field]))
+                  for field, value in sample.items()}
+        data_pred = self.network.predict(self.data_transformation.transform_before_prediction(sample))
+        return {field: self.normalize_data(self.network.tensor_to_numpy(value[0]),
+                                           normalization[self.network.pred_norm_fields[field]], reverse=True)
+                for field, value in data_pred.items()}
+
+
+class TestPredictBatch(TestCase):
+
+    def setUp(self):
+        self.network_manager = NetworkManagerStub()
+        self.normalization = {'input': [1., 2.], 'ground_truth': [0.5, 3.]}
+        self.batch = {'input': np.random.default_rng(1).random((4, 5, 3)), 'ground_truth': np.zeros((4, 5, 3))}
+
+    def test_predict_batch(self):
+        # A single forward pass for the whole batch
+        predictions = predict_batch(self.network_manager, self.batch, self.normalization)
+        self.assertEqual(self.network_manager.network.nb_forwards, 1)
+        self.assertEqual(predictions['prediction'].shape, (4, 5, 3))
+        # Predictions of the samples match separate forward passes
+        for sample_id in range(4):
+            expected = self.network_manager.compute_online_prediction({'input': self.batch['input'][sample_id]},
+                                                                      self.normalization)
+            self.assertTrue(np.allclose(predictions['prediction'][sample_id], expected['prediction']))
+
+    def test_batch_size(self):
+        # ValueError
+        self.network_manager.network.net_fields = ['input', 'ground_truth']
+        with self.assertRaises(ValueError):
+            predict_batch(self.network_manager, {'input': self.batch['input'], 'ground_truth': np.zeros((3, 5, 3))})
+
+    def test_timer(self):
+        # A single measure of each phase per batch
+        timer = PhaseTimer()
+        predict_batch(self.network_manager, self.batch, self.normalization, timer=timer)
+        summary = timer.summary()
+        self.assertEqual(summary['normalization']['count'], 1)
+        self.assertEqual(summary['forward']['count'], 1)
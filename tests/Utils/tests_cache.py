@@ -0,0 +1,45 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.cache import cached_values
+
+
+class TestCachedValues(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.mesh = join(self.directory.name, 'mesh.obj')
+        with open(self.mesh, 'w') as file:
+            file.write('v 0. 0. 0.\n')
+        self.nb_calls = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def compute(self):
+        self.nb_calls += 1
+        return {'nb_nodes': np.int64(1), 'center': np.zeros(3), 'box': (0., 0., 0., 1., 1., 1.)}
+
+    def test_cached_values(self):
+        cache_dir = join(self.directory.name, 'cache')
+        values = cached_values(name='mesh', compute=self.compute, files=[self.mesh], cache_dir=cache_dir, scale=1.)
+        cached = cached_values(name='mesh', compute=self.compute, files=[self.mesh], cache_dir=cache_dir, scale=1.)
+        self.assertEqual(self.nb_calls, 1)
+        # Computed and cached values have the same types
+        for result in [values, cached]:
+            self.assertEqual(type(result['nb_nodes']), int)
+            self.assertEqual(type(result['center']), np.ndarray)
+            self.assertEqual(result['center'].dtype, np.float64)
+            self.assertEqual(type(result['box']), list)
+        self.assertEqual(cached['nb_nodes'], 1)
+        self.assertTrue(np.array_equal(cached['center'], values['center']))
+        self.assertEqual(cached['box'], values['box'])
+        # Values are computed again if the parameters or the content of the files change
+        cached_values(name='mesh', compute=self.compute, files=[self.mesh], cache_dir=cache_dir, scale=2.)
+        self.assertEqual(self.nb_calls, 2)
+        with open(self.mesh, 'a') as file:
+            file.write('v 1. 1. 1.\n')
+        cached_values(name='mesh', compute=self.compute, files=[self.mesh], cache_dir=cache_dir, scale=1.)
+        self.assertEqual(self.nb_calls, 3)
@@ -0,0 +1,122 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.grid import regular_grid_indices, grid_correspondence, sparse_grid_correspondence, \
+    GridIncidence
+
+
+class Data:
+
+    def __init__(self, value):
+        self.value = value
+
+    def array(self):
+        return self.value
+
+
+class SparseGridStub:
+
+    def __init__(self, indices, resolution, bbox_min, bbox_max):
+        # Indices of the regular grid nodes returned by SOFA
+        self.indices = indices
+        self.n, self.min, self.max = Data(resolution), Data(bbox_min), Data(bbox_max)
+        self.nb_calls = 0
+
+    def getRegularGridNodeIndex(self, i):
+        self.nb_calls += 1
+        return int(self.indices[i])
+
+
+class MechanicalObjectStub:
+
+    def __init__(self, rest_position):
+        self.rest_position = Data(rest_position)
+
+
+class TestGridCorrespondence(TestCase):
+
+    def setUp(self):
+        # Regular grid of 4 x 3 x 2 nodes in [0, 3] x [0, 4] x [0, 1]
+        self.resolution = [4, 3, 2]
+        self.bbox_min, self.bbox_max = [0., 0., 0.], [3., 4., 1.]
+        x, y, z = np.meshgrid(np.linspace(0, 3, 4), np.linspace(0, 4, 3), np.linspace(0, 1, 2), indexing='ij')
+        self.regular_grid = np.stack([x.ravel(order='F'), y.ravel(order='F'), z.ravel(order='F')], axis=1)
+
+    def test_regular_grid_indices(self):
+        # Nodes are numbered along x first, then y, then z
+        indices = regular_grid_indices(self.regular_grid, self.bbox_min, self.bbox_max, self.resolution)
+        self.assertTrue(np.array_equal(indices, np.arange(24)))
+        # Small numerical errors on the positions are rounded
+        sparse_nodes = np.array([5, 0, 23, 12])
+        positions = self.regular_grid[sparse_nodes] + 1e-9
+        self.assertTrue(np.array_equal(regular_grid_indices(positions, self.bbox_min, self.bbox_max,
+                                                            self.resolution), sparse_nodes))
+
+    def test_flat_regular_grid(self):
+        # A single node along z does not define any cell in this direction
+        positions = self.regular_grid[self.regular_grid[:, 2] == 0.]
+        with np.errstate(divide='raise', invalid='raise'):
+            indices = regular_grid_indices(positions, self.bbox_min, [3., 4., 0.], [4, 3, 1])
+        self.assertTrue(np.array_equal(indices, np.arange(12)))
+
+    def test_grid_correspondence(self):
+        sparse_nodes = np.array([5, 0, 23, 12])
+        correspondence = grid_correspondence(sparse_nodes, self.regular_grid[sparse_nodes], 24)
+        self.assertEqual(correspondence['idx_sparse_to_regular'].dtype, np.int32)
+        self.assertTrue(np.array_equal(correspondence['idx_sparse_to_regular'], sparse_nodes))
+        # Both directions are consistent and empty nodes are mapped to -1
+        idx_regular_to_sparse = correspondence['idx_regular_to_sparse']
+        self.assertTrue(np.array_equal(idx_regular_to_sparse[sparse_nodes], np.arange(4)))
+        self.assertEqual(np.count_nonzero(idx_regular_to_sparse == -1), 20)
+        # Rest positions are scattered on the regular grid
+        rest_shape = correspondence['regular_grid_rest_shape']
+        self.assertTrue(np.array_equal(rest_shape[sparse_nodes], self.regular_grid[sparse_nodes]))
+        self.assertEqual(rest_shape.shape, (24, 3))
+
+    def test_sparse_grid_correspondence(self):
+        sparse_nodes = np.array([5, 0, 23, 12])
+        with TemporaryDirectory() as cache_dir:
+            # The indices computed from the positions are used if they match SOFA
+            sparse_grid = SparseGridStub(sparse_nodes, self.resolution, self.bbox_min, self.bbox_max)
+            mo = MechanicalObjectStub(self.regular_grid[sparse_nodes])
+            correspondence = sparse_grid_correspondence(sparse_grid, mo, 24, cache_dir=cache_dir)
+            self.assertTrue(np.array_equal(correspondence['idx_sparse_to_regular'], sparse_nodes))
+            # SOFA numbers the nodes differently: every index is then queried from SOFA
+            permuted = np.array([0, 5, 12, 23])
+            sparse_grid = SparseGridStub(permuted, self.resolution, self.bbox_min, self.bbox_max)
+            correspondence = sparse_grid_correspondence(sparse_grid, mo, 24, parameters={'mesh': 'stub'},
+                                                        cache_dir=cache_dir)
+            self.assertTrue(np.array_equal(correspondence['idx_sparse_to_regular'], permuted))
+            # The few nodes of the grid are all checked, then all queried
+            self.assertEqual(sparse_grid.nb_calls, 2 * len(permuted))
+            # The fallback result is cached, SOFA is not queried anymore
+            sparse_grid = SparseGridStub(permuted, self.resolution, self.bbox_min, self.bbox_max)
+            cached = sparse_grid_correspondence(sparse_grid, mo, 24, parameters={'mesh': 'stub'}, cache_dir=cache_dir)
+            self.assertEqual(sparse_grid.nb_calls, 0)
+            for field, value in correspondence.items():
+                self.assertTrue(np.array_equal(cached[field], value))
+
+
+class TestGridIncidence(TestCase):
+
+    def setUp(self):
+        # Three points associated to overlapping sets of nodes, the last node is out of the grid
+        self.rows = [[0, 1, 2], [2, 3], [3, 4, 6]]
+        self.incidence = GridIncidence(rows=self.rows, nb_nodes_regular_grid=6)
+
+    def test_nodes_of(self):
+        self.assertTrue(np.array_equal(self.incidence.nodes_of([2, 0]), [3, 4, 0, 1, 2]))
+        self.assertEqual(len(self.incidence.nodes_of([])), 0)
+
+    def test_scatter(self):
+        sources = [([1], np.array([1., 1., 1.])), ([0], np.zeros(3)), ([0, 2], np.array([2., 2., 2.]))]
+        out = self.incidence.scatter(sources=sources, out=np.full((6, 3), 5.))
+        # Reference encoding with Python loops, the first non-null value written on a node is kept
+        expected = np.zeros((6, 3))
+        for points, value in sources:
+            for point in points:
+                for node in self.rows[point]:
+                    if node < 6 and np.linalg.norm(expected[node]) == 0.:
+                        expected[node] = value
+        self.assertTrue(np.array_equal(out, expected))
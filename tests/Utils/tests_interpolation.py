@@ -0,0 +1,34 @@
+from unittest import TestCase
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.interpolation import PredictionInterpolator
+
+
+class TestPredictionInterpolator(TestCase):
+
+    def test_init(self):
+        # ValueError
+        with self.assertRaises(ValueError):
+            PredictionInterpolator(stride=0)
+        with self.assertRaises(ValueError):
+            PredictionInterpolator(stride=2, method='nearest')
+
+    def test_linear(self):
+        interpolator = PredictionInterpolator(stride=4)
+        self.assertIsNone(interpolator.get(0))
+        interpolator.push({'prediction': np.zeros((2, 3))})
+        self.assertTrue(np.array_equal(interpolator.get(2)['prediction'], np.zeros((2, 3))))
+        # Predictions are interpolated between the two last pushed predictions
+        interpolator.push({'prediction': np.full((2, 3), 4.)})
+        for frame in range(4):
+            self.assertTrue(np.allclose(interpolator.get(frame)['prediction'], frame))
+
+    def test_spline(self):
+        interpolator = PredictionInterpolator(stride=4, method='spline')
+        for value in [0., 1., 2.]:
+            interpolator.push({'prediction': np.full(3, value)})
+        # Keyframes are matched and a linear motion is preserved
+        self.assertTrue(np.allclose(interpolator.get(0)['prediction'], 1.))
+        self.assertTrue(np.allclose(interpolator.get(2)['prediction'], 1.5))
+        # Output buffers are reused
+        self.assertIs(interpolator.get(1)['prediction'], interpolator.get(3)['prediction'])
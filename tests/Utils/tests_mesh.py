@@ -0,0 +1,52 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+from os.path import join
+from os import listdir
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.mesh import read_obj, parse_obj, bounding_box, center_of_mass, extremity, box_roi
+
+
+class TestMesh(TestCase):
+
+    def setUp(self):
+        # Unit square made of a quad and a triangle with texture and normal indices
+        self.content = b'# square\n' \
+                       b'v 0. 0. 0.\nv 1. 0. 0.\nv 1. 1. 0.\nv 0. 1. 0.\nv 0.5 0.5 1.\n' \
+                       b'vt 0. 0.\nvn 0. 0. 1.\n' \
+                       b'f 1/1/1 2/1/1 3/1/1 4/1/1\nf 1//1 2//1 -1//1\n'
+
+    def test_parse_obj(self):
+        mesh = parse_obj(self.content)
+        self.assertEqual(mesh['points'].shape, (5, 3))
+        self.assertTrue(np.array_equal(mesh['points'][4], [0.5, 0.5, 1.]))
+        # Quads are triangulated and indices start from 0
+        self.assertTrue(np.array_equal(mesh['faces'], [[0, 1, 4], [0, 1, 2], [0, 2, 3]]))
+
+    def test_read_obj(self):
+        with TemporaryDirectory() as directory:
+            file_path = join(directory, 'square.obj')
+            with open(file_path, 'wb') as file:
+                file.write(self.content)
+            cache_dir = join(directory, 'cache')
+            mesh = read_obj(file_path, cache_dir=cache_dir)
+            # The second read memory-maps the cached arrays
+            cached = read_obj(file_path, cache_dir=cache_dir)
+            self.assertEqual(len(listdir(cache_dir)), 1)
+            self.assertTrue(isinstance(cached['points'], np.memmap))
+            self.assertTrue(np.array_equal(cached['points'], mesh['points']))
+            self.assertTrue(np.array_equal(cached['faces'], mesh['faces']))
+
+    def test_queries(self):
+        points = parse_obj(self.content)['points']
+        bbox_min, bbox_max = bounding_box(points, scale=2., margin_scale=0.5)
+        self.assertTrue(np.allclose(bbox_min, [-1., -1., -1.]))
+        self.assertTrue(np.allclose(bbox_max, [3.5, 3.5, 3.5]))
+        self.assertTrue(np.allclose(center_of_mass(points, scale=10.), [5., 5., 2.]))
+        self.assertTrue(np.array_equal(box_roi(points, [0.5, -np.inf, -np.inf, np.inf, np.inf, np.inf]), [1, 2, 4]))
+        self.assertTrue(np.array_equal(extremity(points, axis=2), [0.5, 0.5, 1.]))
+        self.assertTrue(np.array_equal(extremity(points, axis=1, maximum=False, box=[0.8, 0., 0., 1., 1., 1.]),
+                                       [1., 0., 0.]))
+        # ValueError
+        with self.assertRaises(ValueError):
+            extremity(points, axis=0, box=[2., 2., 2., 3., 3., 3.])
@@ -0,0 +1,36 @@
+from unittest import TestCase
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.prediction_cache import PredictionCache
+
+
+class TestPredictionCache(TestCase):
+
+    def test_init(self):
+        # ValueError
+        with self.assertRaises(ValueError):
+            PredictionCache(max_size=0)
+        with self.assertRaises(ValueError):
+            PredictionCache(quantization=0.)
+
+    def test_lru(self):
+        cache = PredictionCache(max_size=2, fields=['input'])
+        keys = [cache.key({'input': np.full(3, i), 'ground_truth': np.zeros(0)}) for i in range(3)]
+        # Keys only depend on the selected fields
+        self.assertEqual(keys[0], cache.key({'input': np.full(3, 0), 'ground_truth': np.ones(2)}))
+        self.assertIsNone(cache.get(keys[0]))
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, {'prediction': np.full(3, i)})
+        # The least recently used prediction is removed first
+        self.assertIsNotNone(cache.get(keys[0]))
+        cache.put(keys[2], {'prediction': np.full(3, 2)})
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertTrue(np.array_equal(cache.get(keys[2])['prediction'], np.full(3, 2)))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_quantization(self):
+        # Close inputs share the same key
+        cache = PredictionCache(quantization=0.1)
+        self.assertEqual(cache.key({'input': np.array([0.51, 1.])}), cache.key({'input': np.array([0.49, 1.02])}))
+        self.assertNotEqual(cache.key({'input': np.array([0.5, 1.])}), cache.key({'input': np.array([0.7, 1.])}))
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.recorder import ChunkedRecorder, load_recording
+
+
+class TestChunkedRecorder(TestCase):
+
+    def test_init(self):
+        # ValueError
+        with TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                ChunkedRecorder(directory=tmp_dir, chunk_size=0)
+
+    def test_record(self):
+        with TemporaryDirectory() as tmp_dir:
+            recorder = ChunkedRecorder(directory=tmp_dir, chunk_size=4)
+            for i in range(10):
+                recorder.append({'input': np.full((2, 3), i), 'prediction': np.full(3, -i, dtype=np.float32)})
+            recorder.close()
+            # Full chunks and the last partial chunk are written
+            self.assertEqual(recorder.nb_chunks, 3)
+            self.assertEqual(len(listdir(tmp_dir)), 6)
+            recording = load_recording(tmp_dir)
+            self.assertEqual(recording['input'].shape, (10, 2, 3))
+            self.assertTrue(np.array_equal(recording['input'][:, 0, 0], np.arange(10)))
+            self.assertEqual(recording['prediction'].dtype, np.float32)
+            self.assertEqual(set(load_recording(tmp_dir, fields=['prediction']).keys()), {'prediction'})
+
+    def test_chunk_order(self):
+        # Chunks are concatenated in the order of their index, beyond the zero-padding
+        with TemporaryDirectory() as tmp_dir:
+            for chunk_id in [999999, 1000000, 2]:
+                np.save(join(tmp_dir, f'input_{chunk_id:06d}.npy'), np.full(1, chunk_id))
+            self.assertTrue(np.array_equal(load_recording(tmp_dir)['input'], [2, 999999, 1000000]))
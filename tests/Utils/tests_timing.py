@@ -0,0 +1,45 @@
+from unittest import TestCase
+from os.path import join
+from tempfile import TemporaryDirectory
+from threading import Thread
+import json
+
+from DeepPhysX.Sofa.Utils.timing import LatencyHistogram, PhaseTimer
+
+
+class TestPhaseTimer(TestCase):
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 101):
+            histogram.add(i * 1e-3)
+        # Percentiles are estimated within the width of a bin
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50), 50e-3, delta=50e-3 * 0.05)
+        self.assertAlmostEqual(histogram.percentile(99), 99e-3, delta=99e-3 * 0.05)
+        self.assertLessEqual(histogram.percentile(100), histogram.max)
+
+    def test_timer(self):
+        timer = PhaseTimer()
+        for _ in range(3):
+            with timer.measure('phase'):
+                pass
+        timer.add('other', 1e-3)
+        summary = timer.summary()
+        self.assertEqual(summary['phase']['count'], 3)
+        self.assertEqual(set(summary['other'].keys()), {'count', 'mean', 'p50', 'p95', 'p99', 'max'})
+        # Statistics are saved in a JSON file
+        with TemporaryDirectory() as tmp_dir:
+            timer.save(join(tmp_dir, 'timings.json'))
+            with open(join(tmp_dir, 'timings.json')) as file:
+                self.assertEqual(json.load(file), summary)
+
+    def test_threads(self):
+        # Measures added from several threads are all counted
+        timer = PhaseTimer()
+        threads = [Thread(target=lambda: [timer.add(f'phase_{i % 3}', 1e-3) for i in range(1000)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum([stats['count'] for stats in timer.summary().values()]), 4000)
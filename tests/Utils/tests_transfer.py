@@ -0,0 +1,46 @@
+from unittest import TestCase
+import numpy as np
+
+from DeepPhysX.Sofa.Utils.transfer import prolongation, restriction, interpolation
+
+
+class TestTransferOperator(TestCase):
+
+    def setUp(self):
+        # Sparse grid of 4 nodes in a regular grid of 3 x 3 x 2 nodes in [0, 2] x [0, 2] x [0, 1]
+        self.idx_sparse_to_regular = np.array([4, 0, 17, 9])
+        self.nb_nodes_regular_grid = 18
+        self.bbox_min, self.bbox_max, self.resolution = [0., 0., 0.], [2., 2., 1.], [3, 3, 2]
+
+    def test_prolongation_restriction(self):
+        sparse = np.random.random((4, 3))
+        regular = prolongation(self.idx_sparse_to_regular, self.nb_nodes_regular_grid).apply(sparse)
+        # Same result as the fancy indexing scatter and gather
+        expected = np.zeros((self.nb_nodes_regular_grid, 3))
+        expected[self.idx_sparse_to_regular] = sparse
+        self.assertTrue(np.array_equal(regular, expected))
+        regular_to_sparse = restriction(self.idx_sparse_to_regular, self.nb_nodes_regular_grid)
+        self.assertEqual(regular_to_sparse.shape, (4, self.nb_nodes_regular_grid))
+        self.assertTrue(np.array_equal(regular_to_sparse.apply(regular), sparse))
+
+    def test_batch(self):
+        batch = np.random.random((5, self.nb_nodes_regular_grid, 3))
+        regular_to_sparse = restriction(self.idx_sparse_to_regular, self.nb_nodes_regular_grid)
+        sparse = regular_to_sparse.apply(batch)
+        self.assertEqual(sparse.shape, (5, 4, 3))
+        self.assertTrue(np.array_equal(sparse, batch[:, self.idx_sparse_to_regular]))
+        # ValueError
+        with self.assertRaises(ValueError):
+            regular_to_sparse.apply(batch.reshape(-1))
+
+    def test_interpolation(self):
+        # Grid nodes are interpolated exactly and linear fields are reproduced
+        x, y, z = np.meshgrid(np.linspace(0, 2, 3), np.linspace(0, 2, 3), np.linspace(0, 1, 2), indexing='ij')
+        nodes = np.stack([x.ravel(order='F'), y.ravel(order='F'), z.ravel(order='F')], axis=1)
+        points = np.array([[0.5, 1.5, 0.2], [2., 2., 1.], [1., 0.25, 0.75]])
+        regular_to_points = interpolation(points, self.bbox_min, self.bbox_max, self.resolution)
+        self.assertTrue(np.allclose(regular_to_points.apply(nodes), points))
+        self.assertTrue(np.allclose(regular_to_points.matrix.sum(axis=1), 1.))
+        # Operators are composed with the sparse grid prolongation
+        sparse_to_points = regular_to_points @ prolongation(self.idx_sparse_to_regular, self.nb_nodes_regular_grid)
+        self.assertEqual(sparse_to_points.shape, (3, 4))